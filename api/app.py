@@ -1,18 +1,53 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
+from api.deps import (get_outbox_repository, order_event_broker,
+                      outbox_worker, partition_maintainer, payment_client,
+                      replica_router)
+from api.middleware import ReadYourWritesMiddleware
+
 from api.handlers.orders import router as order_router
 from api.handlers.products import router as product_router
 from api.handlers.users import router as user_router
 from api.handlers.auth import router as auth_router
 from api.handlers.cart import router as cart_router
 from api.handlers.sellers import router as seller_router
+from api.handlers.admin import router as admin_router
+from common.settings import settings
+from services.orders import get_outbox_handlers
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await replica_router.start()
+    await partition_maintainer.start()
+    await order_event_broker.start()
+    await payment_client.open()
+    await outbox_worker.start(
+        get_outbox_handlers(payment_client, get_outbox_repository())
+    )
+    try:
+        yield
+    finally:
+        await outbox_worker.stop()
+        await payment_client.close()
+        await order_event_broker.stop()
+        await partition_maintainer.stop()
+        await replica_router.stop()
 
 
 def create_app():
     app = FastAPI(
         title="Shopping cart API",
         docs_url='/api/docs',
+        lifespan=lifespan,
     )
+    if replica_router.replicas and settings.db_read_your_writes_seconds:
+        app.add_middleware(
+            ReadYourWritesMiddleware,
+            window=settings.db_read_your_writes_seconds,
+        )
 
     app.include_router(user_router, prefix='/api/me' )
     app.include_router(order_router, prefix='/api/me')
@@ -20,5 +55,6 @@ def create_app():
     app.include_router(cart_router, prefix='/api')
     app.include_router(product_router, prefix='/api')
     app.include_router(seller_router, prefix='/api')
+    app.include_router(admin_router, prefix='/api')
 
     return app
@@ -1,20 +1,116 @@
+from time import time
 from typing import AsyncGenerator
 
+import httpx
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from db.db import async_engine
-from repositories.orders import SQLAOrderRepository
-from repositories.products import SQLAProductRepository
+from common.settings import settings
+from db.db import async_engine, replica_engines
+from db.replicas import ReplicaRouter
+from repositories.analytics import SQLAAnalyticsRepository
+from repositories.idempotency import SQLAIdempotencyRepository
+from repositories.orders import ORDER_EVENTS_CHANNEL, SQLAOrderRepository
+from repositories.outbox import SQLAOutboxRepository
+from repositories.partitions import SQLAPartitionRepository
+from repositories.products import (CachedProductRepository,
+                                   SQLAProductRepository)
 from repositories.users import SQLAUserRepository
 from repositories.cart import SQLACartRepository
+from services.order_events import OrderEventBroker
+from services.outbox import OutboxWorker
+from services.partitions import PartitionMaintainer
+from services.payments import PaymentClient
+from utils.cache import TTLCache
+from utils.circuit_breaker import CircuitBreaker
 
 
 async_session = async_sessionmaker(async_engine, expire_on_commit=False)
+replica_router = ReplicaRouter(
+    async_session,
+    {
+        replica: async_sessionmaker(engine, expire_on_commit=False)
+        for replica, engine in replica_engines.items()
+    },
+    check_interval=settings.db_replica_check_interval,
+    check_timeout=settings.db_replica_check_timeout,
+    max_lag=settings.db_replica_max_lag,
+)
 
+READ_PRIMARY_COOKIE = 'read_primary_until'
 
-async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+product_cache = TTLCache(
+    maxsize=settings.product_cache_size,
+    ttl=settings.product_cache_ttl,
+)
+seller_products_cache = TTLCache(
+    maxsize=settings.seller_products_cache_size,
+    ttl=settings.product_cache_ttl,
+)
+
+payment_client = PaymentClient(
+    settings.payment_service_url,
+    limits=httpx.Limits(
+        max_connections=settings.payment_max_connections,
+        max_keepalive_connections=settings.payment_max_keepalive_connections,
+        keepalive_expiry=settings.payment_keepalive_expiry,
+    ),
+    timeout=settings.payment_timeout,
+    deadline=settings.payment_deadline,
+    max_concurrency=settings.payment_max_concurrency,
+    retries=settings.payment_retries,
+    backoff_base=settings.payment_backoff_base,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.payment_breaker_threshold,
+        recovery_timeout=settings.payment_breaker_recovery,
+    ),
+)
+outbox_worker = OutboxWorker(
+    async_session,
+    SQLAOutboxRepository(),
+    workers=settings.outbox_workers,
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval,
+    max_attempts=settings.outbox_max_attempts,
+    backoff_base=settings.outbox_backoff_base,
+    backoff_max=settings.outbox_backoff_max,
+    lease=settings.outbox_lease_seconds,
+)
+partition_maintainer = PartitionMaintainer(
+    async_session,
+    SQLAPartitionRepository(),
+    months_ahead=settings.order_partitions_ahead,
+    retention_months=settings.order_partition_retention_months,
+    interval=settings.order_partition_maintenance_interval,
+)
+order_event_broker = OrderEventBroker(
+    settings.db_direct_string,
+    ORDER_EVENTS_CHANNEL,
+    queue_size=settings.order_events_queue_size,
+    reconnect_delay=settings.order_events_reconnect_delay,
+)
+
+
+async def get_async_session(
+    request: Request
+) -> AsyncGenerator[AsyncSession, None]:
     try:
         session: AsyncSession = async_session()
+        request.state.session = session
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_read_session(
+    request: Request
+) -> AsyncGenerator[AsyncSession, None]:
+    try:
+        pinned = float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time()
+    except ValueError:
+        pinned = False
+    session: AsyncSession = await replica_router.open_session(pinned)
+    try:
         yield session
     finally:
         await session.close()
@@ -25,7 +121,10 @@ def get_user_repository():
 
 
 def get_product_repository():
-    return SQLAProductRepository()
+    return CachedProductRepository(
+        SQLAProductRepository(), product_cache, seller_products_cache,
+        replica_ttl=settings.db_replica_max_lag,
+    )
 
 
 def get_order_repository():
@@ -34,3 +133,15 @@ def get_order_repository():
 
 def get_cart_repository():
     return SQLACartRepository()
+
+
+def get_analytics_repository():
+    return SQLAAnalyticsRepository()
+
+
+def get_idempotency_repository():
+    return SQLAIdempotencyRepository()
+
+
+def get_outbox_repository():
+    return SQLAOutboxRepository()
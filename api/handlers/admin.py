@@ -0,0 +1,58 @@
+from fastapi import Depends
+from fastapi.routing import APIRouter
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.deps import (get_async_session, get_user_repository,
+                      order_event_broker, outbox_worker,
+                      partition_maintainer, payment_client, product_cache,
+                      replica_router, seller_products_cache)
+from api.routing import UnitOfWorkRoute
+from api.schemas.users import UserResponseSchema, UserUpdateSchema
+from db.db import async_engine
+from models.users import Principal, UserRole
+from repositories.users import IUserRepository
+from services.auth import (get_current_active_user, password_executor,
+                           principal_cache)
+from services.users import update_user
+
+
+router = APIRouter(
+    prefix='/admin', tags=['admin'], route_class=UnitOfWorkRoute
+)
+
+
+@router.patch('/users/{user_id}')
+async def update_user_handler(
+    user_id: int,
+    user_update_schema: UserUpdateSchema,
+    session: AsyncSession = Depends(get_async_session),
+    user_repository: IUserRepository = Depends(get_user_repository),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.ADMIN])
+    ),
+) -> UserResponseSchema:
+    user = await update_user(
+        user_repository, session, user_id,
+        **user_update_schema.model_dump(exclude_none=True)
+    )
+    return user
+
+
+@router.get('/metrics')
+async def get_metrics_handler(
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.ADMIN])
+    ),
+) -> dict:
+    return {
+        'principal_cache': principal_cache.stats(),
+        'password_executor': password_executor.stats(),
+        'product_cache': product_cache.stats(),
+        'seller_products_cache': seller_products_cache.stats(),
+        'outbox_worker': outbox_worker.stats(),
+        'payment_client': payment_client.stats(),
+        'partition_maintainer': partition_maintainer.stats(),
+        'order_event_broker': order_event_broker.stats(),
+        'db_pool': async_engine.pool.stats(),
+        'replicas': replica_router.stats(),
+    }
@@ -7,13 +7,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.schemas.users import (Token, UserCreateSchema,
                                UserCreateResponseSchema)
 from api.deps import get_async_session, get_user_repository
+from api.routing import UnitOfWorkRoute
 from repositories.users import IUserRepository
-from services.auth import create_access_token, authenticate_user
+from services.auth import (create_access_token, authenticate_user,
+                           get_token_claims)
 from common.settings import settings
 from services.users import create_user
 
 
-router = APIRouter(tags=['auth'])
+router = APIRouter(tags=['auth'], route_class=UnitOfWorkRoute)
 
 
 @router.post('/login')
@@ -26,7 +28,7 @@ async def login_for_auth_token(
                              form_data.username, form_data.password)
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data=get_token_claims(user), expires_delta=access_token_expires
     )
     return Token(access_token=access_token, token_type="bearer")
 
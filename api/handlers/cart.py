@@ -1,27 +1,35 @@
-from fastapi import Depends, HTTPException, status
+from functools import partial
+
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.deps import (get_async_session, get_cart_repository, 
-                      get_product_repository)
+from api.deps import (get_async_session, get_cart_repository,
+                      get_idempotency_repository, get_product_repository,
+                      get_read_session)
+from api.routing import UnitOfWorkRoute
 from services.auth import get_current_active_user
+from services.idempotency import get_request_fingerprint, run_idempotent
 from services.cart import (get_cart, add_item_to_cart,
                            remove_item_from_cart)
 from api.schemas.cart import CartResponseSchema, CartAddRemoveSchema
-from models.users import User, UserRole
+from models.users import Principal, UserRole
 from repositories.cart import ICartRepository
+from repositories.idempotency import IIdempotencyRepository
 from repositories.products import IProductRepository
 
 
-router = APIRouter(prefix='/cart', tags=['cart'])
+router = APIRouter(
+    prefix='/cart', tags=['cart'], route_class=UnitOfWorkRoute
+)
 
 
 @router.get('')
 async def get_cart_handler(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     cart_repository: ICartRepository = Depends(get_cart_repository),
     product_repository: IProductRepository = Depends(get_product_repository),
-    current_user: User = Depends(
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.CUSTOMER])
     ),
 ) -> CartResponseSchema:
@@ -32,29 +40,42 @@ async def get_cart_handler(
 @router.post('')
 async def add_item_to_cart_handler(
     cart_schema: CartAddRemoveSchema,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     session: AsyncSession = Depends(get_async_session),
     cart_repository: ICartRepository = Depends(get_cart_repository),
     product_repository: IProductRepository = Depends(get_product_repository),
-    current_user: User = Depends(
+    idempotency_repository: IIdempotencyRepository = Depends(
+        get_idempotency_repository),
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.CUSTOMER])
     ),
 ) -> None:
-    await add_item_to_cart(
-        session, cart_repository, product_repository,
-        current_user.id, cart_schema.product_id
+    await run_idempotent(
+        idempotency_repository, session, current_user.id, idempotency_key,
+        await get_request_fingerprint(request),
+        partial(add_item_to_cart, session, cart_repository,
+                product_repository, current_user.id,
+                cart_schema.product_id, cart_schema.quantity)
     )
 
 
 @router.delete('')
 async def remove_item_from_cart_handler(
     product_id: int,
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     session: AsyncSession = Depends(get_async_session),
     cart_repository: ICartRepository = Depends(get_cart_repository),
-    current_user: User = Depends(
+    idempotency_repository: IIdempotencyRepository = Depends(
+        get_idempotency_repository),
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.CUSTOMER])
     ),
 ) -> None:
-    await remove_item_from_cart(
-        session, cart_repository,
-        current_user.id, product_id
+    await run_idempotent(
+        idempotency_repository, session, current_user.id, idempotency_key,
+        await get_request_fingerprint(request),
+        partial(remove_item_from_cart, session, cart_repository,
+                current_user.id, product_id)
     )
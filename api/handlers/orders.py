@@ -1,56 +1,98 @@
-from fastapi import Depends, HTTPException
+from datetime import datetime
+from functools import partial
+
+from fastapi import Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
 from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import (get_async_session, get_order_repository,
-                      get_cart_repository, get_product_repository)
+                      get_idempotency_repository, get_read_session,
+                      order_event_broker)
+from api.routing import UnitOfWorkRoute
 from api.schemas.orders import (OrderCreateResponseSchema,
-                                UserOrderResponseSchema)
+                                UserOrderResponseSchema, UserOrderPageSchema,
+                                UserOrderSummaryPageSchema)
+from repositories.idempotency import IIdempotencyRepository
 from repositories.orders import IOrderRepository
-from repositories.products import IProductRepository
-from repositories.cart import ICartRepository
-from models.users import User, UserRole
+from models.users import Principal, UserRole
+from common.settings import settings
 from models.orders import OrderStatus
-from services.orders import create_order
+from services.orders import create_order, get_user_orders
 from services.auth import get_current_active_user
+from services.idempotency import get_request_fingerprint, run_idempotent
+from services.order_events import stream_order_events
 
 
-router = APIRouter(prefix='/orders', tags=['orders'])
+router = APIRouter(
+    prefix='/orders', tags=['orders'], route_class=UnitOfWorkRoute
+)
 
 
 @router.get('')
 async def get_my_orders_handler(
-    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    order_status: OrderStatus | None = Query(None, alias='status'),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    summary: bool = False,
+    session: AsyncSession = Depends(get_read_session),
     order_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(get_current_active_user(
+    current_user: Principal = Depends(get_current_active_user(
         required_roles=[UserRole.CUSTOMER])
     ),
-) -> list[UserOrderResponseSchema]:
-    orders = await order_repository.get_user_orders(session, current_user.id)
-    return orders
+) -> UserOrderPageSchema | UserOrderSummaryPageSchema:
+    page = await get_user_orders(
+        order_repository, session, current_user.id, limit, cursor,
+        order_status, created_from, created_to, summary)
+    return page
 
 
 @router.post('')
 async def create_order_handler(
+    request: Request,
+    idempotency_key: str | None = Header(None, max_length=255),
     session: AsyncSession = Depends(get_async_session),
     order_repository: IOrderRepository = Depends(get_order_repository),
-    cart_repository: ICartRepository = Depends(get_cart_repository),
-    current_user: User = Depends(
+    idempotency_repository: IIdempotencyRepository = Depends(
+        get_idempotency_repository),
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.CUSTOMER])
     ),
 ) -> OrderCreateResponseSchema:
-    order_id = await create_order(
-        session, order_repository, cart_repository, current_user.id)
+    order_id = await run_idempotent(
+        idempotency_repository, session, current_user.id, idempotency_key,
+        await get_request_fingerprint(request),
+        partial(create_order, session, order_repository, current_user.id)
+    )
     return OrderCreateResponseSchema(id=order_id)
 
 
+@router.get('/events')
+async def get_my_order_events_handler(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.CUSTOMER])
+    ),
+) -> StreamingResponse:
+    await session.close()
+    return StreamingResponse(
+        stream_order_events(order_event_broker,
+                            settings.order_events_heartbeat,
+                            customer_id=current_user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @router.get('/{order_id}')
 async def get_order_handler(
     order_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     order_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.CUSTOMER])
     ),
 ) -> UserOrderResponseSchema:
@@ -1,27 +1,44 @@
-from fastapi import Depends
+from fastapi import Depends, Query, Request
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.deps import get_async_session, get_product_repository
-from api.schemas.products import (ProductCreateSchema,
+from api.deps import (get_async_session, get_product_repository,
+                      get_read_session)
+from api.routing import UnitOfWorkRoute
+from api.schemas.products import (ProductBulkCreateResponseSchema,
+                                  ProductCreateSchema,
                                   ProductCreateResponseSchema,
+                                  ProductPageSchema,
                                   ProductResponseSchema)
-from models.users import User, UserRole
+from models.users import Principal, UserRole
 from repositories.products import IProductRepository
 from services.auth import get_current_active_user
-from services.products import create_product, check_product_exists
+from services.products import (create_product, check_product_exists,
+                               get_products_page, import_products)
+from utils.pagination import SortOrder
 
 
-router = APIRouter(prefix='/products', tags=['products'])
+router = APIRouter(
+    prefix='/products', tags=['products'], route_class=UnitOfWorkRoute
+)
 
 
 @router.get('')
 async def get_products(
-    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    seller_id: int | None = None,
+    min_cost: int | None = Query(None, ge=0),
+    max_cost: int | None = Query(None, ge=0),
+    order: SortOrder = SortOrder.DESC,
+    session: AsyncSession = Depends(get_read_session),
     product_repository: IProductRepository = Depends(get_product_repository),
-) -> list[ProductResponseSchema]:
-    products = await product_repository.get_all(session)
-    return products
+) -> ProductPageSchema:
+    page = await get_products_page(
+        session, product_repository, limit, cursor,
+        seller_id, min_cost, max_cost, order
+    )
+    return page
 
 
 @router.post('')
@@ -29,7 +46,7 @@ async def create_product(
     product_create_schema: ProductCreateSchema,
     session: AsyncSession = Depends(get_async_session),
     product_repository: IProductRepository = Depends(get_product_repository),
-    current_user: User = Depends(
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.SELLER])
     ),
 ) -> ProductCreateResponseSchema:
@@ -40,10 +57,39 @@ async def create_product(
     return ProductCreateResponseSchema(id=product_id)
 
 
+@router.post('/bulk')
+async def create_products_bulk(
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
+    product_repository: IProductRepository = Depends(get_product_repository),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.SELLER])
+    ),
+) -> ProductBulkCreateResponseSchema:
+    content_type = request.headers.get('content-type', 'application/json')
+    result = await import_products(
+        session, product_repository, current_user.id,
+        content_type.split(';')[0].strip(), request.stream()
+    )
+    return result
+
+
+@router.get('/search')
+async def search_products(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=1000),
+    session: AsyncSession = Depends(get_read_session),
+    product_repository: IProductRepository = Depends(get_product_repository),
+) -> list[ProductResponseSchema]:
+    products = await product_repository.search(session, q, limit, offset)
+    return products
+
+
 @router.get('/{product_id}')
 async def get_product(
     product_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     product_repository: IProductRepository = Depends(get_product_repository),
 ):
     await check_product_exists(session, product_repository, product_id)
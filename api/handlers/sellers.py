@@ -1,29 +1,80 @@
-from fastapi import Depends
+from datetime import date
+
+from fastapi import Depends, Query
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.deps import (get_async_session, get_product_repository,
-                      get_order_repository)
+from api.deps import (get_analytics_repository, get_async_session,
+                      get_product_repository, get_order_repository,
+                      get_read_session, order_event_broker)
+from api.routing import UnitOfWorkRoute
+from api.schemas.analytics import (SellerDailySalesSchema,
+                                   SellerProductDailySalesSchema)
 from api.schemas.products import (ProductResponseSchema,
                                   ProductInSellerOrderSchema)
-from api.schemas.orders import SellerOrderResponseSchema
-from api.schemas.sellers import SellerUpdateProductStatusSchema
-from models.users import User, UserRole
+from api.schemas.orders import (SellerOrderPageSchema,
+                                SellerOrderResponseSchema)
+from api.schemas.sellers import (SellerUpdateProductStatusSchema,
+                                 SellerBulkUpdateProductStatusSchema)
+from common.settings import settings
+from models.users import Principal, UserRole
 from models.products import ProductStatus
+from repositories.analytics import IAnalyticsRepository
 from repositories.products import IProductRepository
 from repositories.orders import IOrderRepository
 from services.orders import (get_seller_sale, get_seller_sales,
-                             get_seller_sale_product, update_product_status)
+                             get_seller_sale_product, update_product_status,
+                             update_products_status)
+from services.analytics import (get_seller_daily_sales,
+                                get_seller_product_daily_sales)
 from services.auth import get_current_active_user
+from services.order_events import stream_order_events
+
 
+router = APIRouter(
+    prefix='/sellers', tags=['sellers'], route_class=UnitOfWorkRoute
+)
 
-router = APIRouter(prefix='/sellers', tags=['sellers'])
+
+@router.get('/analytics/daily')
+async def get_seller_daily_sales_handler(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    analytics_repository: IAnalyticsRepository = Depends(
+        get_analytics_repository),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.SELLER])
+    ),
+) -> list[SellerDailySalesSchema]:
+    sales = await get_seller_daily_sales(
+        analytics_repository, session, current_user.id, date_from, date_to)
+    return sales
+
+
+@router.get('/analytics/products')
+async def get_seller_product_daily_sales_handler(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    product_id: int | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    analytics_repository: IAnalyticsRepository = Depends(
+        get_analytics_repository),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.SELLER])
+    ),
+) -> list[SellerProductDailySalesSchema]:
+    sales = await get_seller_product_daily_sales(
+        analytics_repository, session, current_user.id,
+        date_from, date_to, product_id)
+    return sales
 
 
 @router.get('/{seller_id}/products')
 async def get_seller_products_handler(
     seller_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     product_repository: IProductRepository = Depends(get_product_repository),
 ) -> list[ProductResponseSchema]:
     products = await product_repository.get_seller_products(session, seller_id)
@@ -32,23 +83,58 @@ async def get_seller_products_handler(
 
 @router.get('/sales')
 async def get_seller_sales_handler(
-    session: AsyncSession = Depends(get_async_session),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
     order_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.SELLER])
     ),
-) -> list[SellerOrderResponseSchema]:
-    orders = await get_seller_sales(
-        order_repository, session, current_user.id)
-    return orders
+) -> SellerOrderPageSchema:
+    page = await get_seller_sales(
+        order_repository, session, current_user.id, limit, cursor)
+    return page
+
+
+@router.patch('/sales')
+async def update_products_status_handler(
+    status_schema: SellerBulkUpdateProductStatusSchema,
+    session: AsyncSession = Depends(get_async_session),
+    orders_repository: IOrderRepository = Depends(get_order_repository),
+    current_user: Principal = Depends(get_current_active_user(
+        required_roles=[UserRole.SELLER])
+    ),
+):
+    await update_products_status(
+        orders_repository, session, current_user.id,
+        [(item.order_id, item.product_id, item.status)
+         for item in status_schema.items]
+    )
+
+
+@router.get('/sales/events')
+async def get_seller_sale_events_handler(
+    session: AsyncSession = Depends(get_async_session),
+    current_user: Principal = Depends(
+        get_current_active_user(required_roles=[UserRole.SELLER])
+    ),
+) -> StreamingResponse:
+    await session.close()
+    return StreamingResponse(
+        stream_order_events(order_event_broker,
+                            settings.order_events_heartbeat,
+                            seller_id=current_user.id),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @router.get('/sales/{order_id}')
 async def get_seller_sale_handler(
     order_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     order_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(
+    current_user: Principal = Depends(
         get_current_active_user(required_roles=[UserRole.SELLER])
     ),
 ) -> SellerOrderResponseSchema:
@@ -61,9 +147,9 @@ async def get_seller_sale_handler(
 async def get_seller_sale_product_handler(
     order_id: int,
     product_id: int,
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_read_session),
     orders_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(get_current_active_user(
+    current_user: Principal = Depends(get_current_active_user(
         required_roles=[UserRole.SELLER])
     ),
 ) -> ProductInSellerOrderSchema:
@@ -79,10 +165,9 @@ async def update_product_status_handler(
     status_schema: SellerUpdateProductStatusSchema,
     session: AsyncSession = Depends(get_async_session),
     orders_repository: IOrderRepository = Depends(get_order_repository),
-    current_user: User = Depends(get_current_active_user(
+    current_user: Principal = Depends(get_current_active_user(
         required_roles=[UserRole.SELLER])
     ),
 ):
-    print(status_schema)
     await update_product_status(orders_repository, session, current_user.id,
                                 order_id, product_id, status_schema.status)
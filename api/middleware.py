@@ -0,0 +1,33 @@
+from time import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.deps import READ_PRIMARY_COOKIE
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, window: int) -> None:
+        self.app = app
+        self.window = window
+
+    async def __call__(self, scope: Scope, receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if (message['type'] == 'http.response.start'
+                    and message['status'] < 400):
+                MutableHeaders(scope=message).append(
+                    'set-cookie',
+                    f'{READ_PRIMARY_COOKIE}={time() + self.window:.3f}; '
+                    f'Max-Age={self.window}; Path=/; HttpOnly; SameSite=lax'
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
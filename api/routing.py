@@ -0,0 +1,34 @@
+from typing import Any, Callable, Coroutine
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_request_session(request: Request) -> AsyncSession | None:
+    return getattr(request.state, 'session', None)
+
+
+class UnitOfWorkRoute(APIRoute):
+    def get_route_handler(
+        self
+    ) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def unit_of_work_handler(request: Request) -> Response:
+            try:
+                response = await route_handler(request)
+            except Exception:
+                session = get_request_session(request)
+                if session is not None:
+                    await session.rollback()
+                raise
+            session = get_request_session(request)
+            if session is not None and session.in_transaction():
+                if response.status_code < 400:
+                    await session.commit()
+                else:
+                    await session.rollback()
+            return response
+
+        return unit_of_work_handler
@@ -0,0 +1,14 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class SellerDailySalesSchema(BaseModel):
+    day: date
+    revenue: int
+    units: int
+    orders_count: int
+
+
+class SellerProductDailySalesSchema(SellerDailySalesSchema):
+    product_id: int
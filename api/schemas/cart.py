@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, PositiveInt
 
 from api.schemas.products import ProductInCartSchema
 
@@ -8,3 +8,4 @@ class CartResponseSchema(BaseModel):
 
 class CartAddRemoveSchema(BaseModel):
     product_id: int
+    quantity: PositiveInt = 1
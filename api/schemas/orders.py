@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from api.schemas.products import (ProductInSellerOrderSchema,
                                   ProductInUserOrderSchema)
@@ -14,12 +14,34 @@ class OrderCreateResponseSchema(BaseModel):
 class UserOrderResponseSchema(OrderCreateResponseSchema):
     status: OrderStatus
     content: list[ProductInUserOrderSchema]
-    #total_cost: int
+    total_cost: int
     created_at: datetime
 
 
+class UserOrderPageSchema(BaseModel):
+    items: list[UserOrderResponseSchema]
+    next_cursor: str | None
+
+
+class UserOrderSummarySchema(OrderCreateResponseSchema):
+    status: OrderStatus
+    item_count: int
+    total_cost: int
+    created_at: datetime
+
+
+class UserOrderSummaryPageSchema(BaseModel):
+    items: list[UserOrderSummarySchema]
+    next_cursor: str | None
+
+
 class SellerOrderResponseSchema(OrderCreateResponseSchema):
     status: OrderStatus
     content: list[ProductInSellerOrderSchema]
-    #total_cost: int
+    total_cost: int = Field(validation_alias='seller_total_cost')
     created_at: datetime
+
+
+class SellerOrderPageSchema(BaseModel):
+    items: list[SellerOrderResponseSchema]
+    next_cursor: str | None
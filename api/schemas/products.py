@@ -1,13 +1,13 @@
 from datetime import datetime
 
-from pydantic import BaseModel, Field, PositiveInt
+from pydantic import BaseModel, Field
 
 from models.products import ProductStatus
 
 
 class ProductCreateSchema(BaseModel):
     title: str
-    cost: PositiveInt
+    cost: int = Field(gt=0, le=2 ** 31 - 1)
 
 
 class ProductResponseSchema(ProductCreateSchema):
@@ -16,10 +16,25 @@ class ProductResponseSchema(ProductCreateSchema):
     created_at: datetime
 
 
+class ProductPageSchema(BaseModel):
+    items: list[ProductResponseSchema]
+    next_cursor: str | None
+
+
 class ProductCreateResponseSchema(BaseModel):
     id: int
 
 
+class ProductImportErrorSchema(BaseModel):
+    row: int
+    error: str
+
+
+class ProductBulkCreateResponseSchema(BaseModel):
+    ids: list[int]
+    errors: list[ProductImportErrorSchema]
+
+
 class ProductInCartSchema(ProductCreateSchema):
     id: int = Field(validation_alias='product_id')
     seller_id: int
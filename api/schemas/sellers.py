@@ -1,4 +1,6 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
+
+from common.settings import settings
 
 from models.products import ProductStatus
 
@@ -11,3 +13,13 @@ class SellerUpdateProductStatusSchema(BaseModel):
         if v not in (ProductStatus.READY_TO_SEND, ProductStatus.SHIPPING):
             raise ValueError('forbidden status value')
         return v
+
+
+class SellerUpdateSaleProductStatusSchema(SellerUpdateProductStatusSchema):
+    order_id: int
+    product_id: int
+
+
+class SellerBulkUpdateProductStatusSchema(BaseModel):
+    items: list[SellerUpdateSaleProductStatusSchema] = Field(
+        min_length=1, max_length=settings.seller_bulk_update_max_items)
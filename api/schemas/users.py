@@ -25,3 +25,8 @@ class UserCreateResponseSchema(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+
+
+class UserUpdateSchema(BaseModel):
+    role: UserRole | None = None
+    disabled: bool | None = None
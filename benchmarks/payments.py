@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+
+import httpx
+
+from services.payments import PaymentClient, PaymentError
+from utils.circuit_breaker import CircuitBreaker
+
+
+SCENARIOS = {
+    'healthy': {'latency': 0.02, 'error_rate': 0.0},
+    'degraded': {'latency': 0.3, 'error_rate': 0.0},
+    'slow': {'latency': 1.0, 'error_rate': 0.0},
+    'flaky': {'latency': 0.02, 'error_rate': 0.3},
+    'outage': {'latency': 0.02, 'error_rate': 1.0},
+}
+FAILURE_PAUSE = 0.1
+
+
+def create_client(base_url: str, breaker: bool) -> PaymentClient:
+    return PaymentClient(
+        base_url,
+        limits=httpx.Limits(max_connections=100,
+                            max_keepalive_connections=100),
+        timeout=0.5,
+        deadline=2,
+        max_concurrency=100,
+        retries=2,
+        backoff_base=0.01,
+        breaker=CircuitBreaker(
+            failure_threshold=5 if breaker else 10 ** 9,
+            recovery_timeout=1,
+        ),
+    )
+
+
+async def run_scenario(client: PaymentClient, callers: int,
+                       duration: float) -> dict:
+    latencies = []
+    failures = 0
+    stop_at = perf_counter() + duration
+
+    async def caller(caller_id: int) -> None:
+        nonlocal failures
+        order_id = caller_id
+        while perf_counter() < stop_at:
+            started_at = perf_counter()
+            try:
+                await client.pay(order_id, 100)
+                latencies.append(perf_counter() - started_at)
+            except PaymentError:
+                failures += 1
+                await asyncio.sleep(FAILURE_PAUSE)
+            order_id += callers
+
+    await client.open()
+    try:
+        await asyncio.gather(*[caller(i) for i in range(callers)])
+    finally:
+        await client.close()
+    latencies.sort()
+    return {
+        'ok/s': len(latencies) / duration,
+        'failed/s': failures / duration,
+        'p50 ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p99 ms': latencies[int(len(latencies) * 0.99)] * 1000
+        if latencies else 0,
+    }
+
+
+async def wait_until_ready(control: httpx.AsyncClient) -> None:
+    for _ in range(100):
+        try:
+            await control.get('/_stats')
+            return
+        except httpx.TransportError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError('fake payment provider did not start')
+
+
+async def main(callers: int, duration: float, port: int) -> None:
+    base_url = f'http://127.0.0.1:{port}'
+    provider = subprocess.Popen([
+        sys.executable, '-m', 'uvicorn', '--factory',
+        'tests.fake_payment_provider:create_app',
+        '--port', str(port), '--log-level', 'warning',
+    ])
+    try:
+        async with httpx.AsyncClient(base_url=base_url) as control:
+            await wait_until_ready(control)
+            header = ('scenario', 'breaker', 'ok/s', 'failed/s', 'p50 ms',
+                      'p99 ms', 'provider calls/s')
+            print(''.join(f'{column:>17}' for column in header))
+            for name, scenario in SCENARIOS.items():
+                for breaker in (False, True):
+                    await control.put('/_config', json=scenario)
+                    result = await run_scenario(
+                        create_client(base_url, breaker), callers, duration)
+                    calls = (await control.get('/_stats')).json()['calls']
+                    row = [name, 'on' if breaker else 'off']
+                    row += [f'{value:.1f}' for value in result.values()]
+                    row.append(f'{calls / duration:.1f}')
+                    print(''.join(f'{column:>17}' for column in row))
+    finally:
+        provider.terminate()
+        provider.wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Payment client throughput under provider slowdowns')
+    parser.add_argument('--callers', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(main(args.callers, args.duration, args.port))
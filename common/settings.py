@@ -14,6 +14,134 @@ class Settings:
         "ACCESS_TOKEN_EXPIRE_MINUTES", 15
     )
     algorithm = dotenv.dotenv_values().get("ALGORITHM", 'HS256')
+    self_contained_tokens = str(dotenv.dotenv_values().get(
+        "SELF_CONTAINED_TOKENS", False
+    )).lower() == 'true'
+    token_denylist_refresh_seconds = int(dotenv.dotenv_values().get(
+        "TOKEN_DENYLIST_REFRESH_SECONDS", 30
+    ))
+    password_hash_workers = int(dotenv.dotenv_values().get(
+        "PASSWORD_HASH_WORKERS", 4
+    ))
+    password_hash_max_concurrency = int(dotenv.dotenv_values().get(
+        "PASSWORD_HASH_MAX_CONCURRENCY", 32
+    ))
+    principal_cache_size = int(dotenv.dotenv_values().get(
+        "PRINCIPAL_CACHE_SIZE", 10000
+    ))
+    principal_cache_ttl = int(dotenv.dotenv_values().get(
+        "PRINCIPAL_CACHE_TTL", 60
+    ))
+    product_cache_size = int(dotenv.dotenv_values().get(
+        "PRODUCT_CACHE_SIZE", 10000
+    ))
+    seller_products_cache_size = int(dotenv.dotenv_values().get(
+        "SELLER_PRODUCTS_CACHE_SIZE", 1000
+    ))
+    product_cache_ttl = int(dotenv.dotenv_values().get(
+        "PRODUCT_CACHE_TTL", 300
+    ))
+    bulk_import_max_rows = int(dotenv.dotenv_values().get(
+        "BULK_IMPORT_MAX_ROWS", 50000
+    ))
+    bulk_import_chunk_size = int(dotenv.dotenv_values().get(
+        "BULK_IMPORT_CHUNK_SIZE", 1000
+    ))
+    bulk_import_max_bytes = int(dotenv.dotenv_values().get(
+        "BULK_IMPORT_MAX_BYTES", 50 * 1024 * 1024
+    ))
+    seller_bulk_update_max_items = int(dotenv.dotenv_values().get(
+        "SELLER_BULK_UPDATE_MAX_ITEMS", 1000
+    ))
+    idempotency_key_ttl = int(dotenv.dotenv_values().get(
+        "IDEMPOTENCY_KEY_TTL", 86400
+    ))
+    idempotency_cache_size = int(dotenv.dotenv_values().get(
+        "IDEMPOTENCY_CACHE_SIZE", 10000
+    ))
+    payment_service_url = dotenv.dotenv_values().get(
+        "PAYMENT_SERVICE_URL", "http://localhost:8001"
+    )
+    payment_max_connections = int(dotenv.dotenv_values().get(
+        "PAYMENT_MAX_CONNECTIONS", 100
+    ))
+    payment_max_keepalive_connections = int(dotenv.dotenv_values().get(
+        "PAYMENT_MAX_KEEPALIVE_CONNECTIONS", 20
+    ))
+    payment_keepalive_expiry = float(dotenv.dotenv_values().get(
+        "PAYMENT_KEEPALIVE_EXPIRY", 30
+    ))
+    payment_timeout = float(dotenv.dotenv_values().get("PAYMENT_TIMEOUT", 2))
+    payment_deadline = float(dotenv.dotenv_values().get(
+        "PAYMENT_DEADLINE", 5
+    ))
+    payment_max_concurrency = int(dotenv.dotenv_values().get(
+        "PAYMENT_MAX_CONCURRENCY", 50
+    ))
+    payment_retries = int(dotenv.dotenv_values().get("PAYMENT_RETRIES", 2))
+    payment_backoff_base = float(dotenv.dotenv_values().get(
+        "PAYMENT_BACKOFF_BASE", 0.1
+    ))
+    payment_breaker_threshold = int(dotenv.dotenv_values().get(
+        "PAYMENT_BREAKER_THRESHOLD", 5
+    ))
+    payment_breaker_recovery = float(dotenv.dotenv_values().get(
+        "PAYMENT_BREAKER_RECOVERY", 30
+    ))
+    outbox_workers = int(dotenv.dotenv_values().get("OUTBOX_WORKERS", 4))
+    outbox_batch_size = int(dotenv.dotenv_values().get(
+        "OUTBOX_BATCH_SIZE", 50
+    ))
+    outbox_poll_interval = float(dotenv.dotenv_values().get(
+        "OUTBOX_POLL_INTERVAL", 1
+    ))
+    outbox_max_attempts = int(dotenv.dotenv_values().get(
+        "OUTBOX_MAX_ATTEMPTS", 10
+    ))
+    outbox_backoff_base = float(dotenv.dotenv_values().get(
+        "OUTBOX_BACKOFF_BASE", 1
+    ))
+    outbox_backoff_max = float(dotenv.dotenv_values().get(
+        "OUTBOX_BACKOFF_MAX", 300
+    ))
+    outbox_lease_seconds = float(dotenv.dotenv_values().get(
+        "OUTBOX_LEASE_SECONDS", 60
+    ))
+    order_partitions_ahead = int(dotenv.dotenv_values().get(
+        "ORDER_PARTITIONS_AHEAD", 3
+    ))
+    order_partition_retention_months = int(dotenv.dotenv_values().get(
+        "ORDER_PARTITION_RETENTION_MONTHS", 0
+    ))
+    order_partition_maintenance_interval = float(dotenv.dotenv_values().get(
+        "ORDER_PARTITION_MAINTENANCE_INTERVAL", 3600
+    ))
+    order_events_queue_size = int(dotenv.dotenv_values().get(
+        "ORDER_EVENTS_QUEUE_SIZE", 100
+    ))
+    order_events_heartbeat = float(dotenv.dotenv_values().get(
+        "ORDER_EVENTS_HEARTBEAT", 15
+    ))
+    order_events_reconnect_delay = float(dotenv.dotenv_values().get(
+        "ORDER_EVENTS_RECONNECT_DELAY", 1
+    ))
+    db_pool_size = int(dotenv.dotenv_values().get("DB_POOL_SIZE", 5))
+    db_max_overflow = int(dotenv.dotenv_values().get("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout = float(dotenv.dotenv_values().get(
+        "DB_POOL_TIMEOUT", 30
+    ))
+    db_pool_recycle = int(dotenv.dotenv_values().get(
+        "DB_POOL_RECYCLE", 1800
+    ))
+    db_pool_pre_ping = str(dotenv.dotenv_values().get(
+        "DB_POOL_PRE_PING", False
+    )).lower() == 'true'
+    db_statement_cache_size = int(dotenv.dotenv_values().get(
+        "DB_STATEMENT_CACHE_SIZE", 100
+    ))
+    db_pgbouncer = str(dotenv.dotenv_values().get(
+        "DB_PGBOUNCER", False
+    )).lower() == 'true'
     postgres_host = dotenv.dotenv_values().get("POSTGRES_HOST", "localhost")
     postgres_port = dotenv.dotenv_values().get("POSTGRES_PORT", 5432)
     postgres_db = dotenv.dotenv_values().get("POSTGRES_DB", "postgres")
@@ -24,9 +152,40 @@ class Settings:
         f"{postgres_user}:{postgres_password}"
         f"@{postgres_host}:{postgres_port}/{postgres_db}"
     )
+    postgres_replicas = [
+        replica for replica in str(dotenv.dotenv_values().get(
+            "POSTGRES_REPLICAS", ""
+        )).split(",") if replica
+    ]
+    db_replica_check_interval = float(dotenv.dotenv_values().get(
+        "DB_REPLICA_CHECK_INTERVAL", 5
+    ))
+    db_replica_check_timeout = float(dotenv.dotenv_values().get(
+        "DB_REPLICA_CHECK_TIMEOUT", 1
+    ))
+    db_replica_max_lag = float(dotenv.dotenv_values().get(
+        "DB_REPLICA_MAX_LAG", 5
+    ))
+    db_read_your_writes_seconds = int(dotenv.dotenv_values().get(
+        "DB_READ_YOUR_WRITES_SECONDS", 5
+    ))
+    postgres_direct_host = dotenv.dotenv_values().get(
+        "POSTGRES_DIRECT_HOST", postgres_host
+    )
+    postgres_direct_port = dotenv.dotenv_values().get(
+        "POSTGRES_DIRECT_PORT", postgres_port
+    )
+    db_direct_string: str = (
+        "postgresql://"
+        f"{postgres_user}:{postgres_password}"
+        f"@{postgres_direct_host}:{postgres_direct_port}/{postgres_db}"
+    )
     postgres_test_port = dotenv.dotenv_values().get(
         "POSTGRES_TEST_PORT", 5433
     )
+    postgres_test_replica_port = dotenv.dotenv_values().get(
+        "POSTGRES_TEST_REPLICA_PORT"
+    )
     db_test_string: str = (
         "postgresql+asyncpg://"
         f"{postgres_user}:{postgres_password}"
@@ -1,6 +1,9 @@
 from db.db import Base  # noqa
 
-from models.orders import Order, OrdersProducts  # noqa
+from models.orders import Order, OrdersProducts, OrdersSellers  # noqa
 from models.products import Product  # noqa
 from models.users import User  # noqa
 from models.cart import Cart  # noqa
+from models.outbox import OutboxMessage  # noqa
+from models.analytics import SellerDailySales, SellerProductDailySales  # noqa
+from models.idempotency import IdempotencyKey  # noqa
@@ -1,14 +1,59 @@
+from uuid import uuid4
+
+from sqlalchemy import URL, make_url
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 
 from common.settings import settings
+from db.pool import InstrumentedAsyncPool, InstrumentedNullPool
 
 
 class Base(DeclarativeBase):
     ...
 
 
+def get_engine_options() -> dict:
+    if settings.db_pgbouncer:
+        return {
+            'poolclass': InstrumentedNullPool,
+            'connect_args': {
+                'statement_cache_size': 0,
+                'prepared_statement_cache_size': 0,
+                'prepared_statement_name_func':
+                    lambda: f'__asyncpg_{uuid4()}__',
+            },
+        }
+    return {
+        'poolclass': InstrumentedAsyncPool,
+        'pool_size': settings.db_pool_size,
+        'max_overflow': settings.db_max_overflow,
+        'pool_timeout': settings.db_pool_timeout,
+        'pool_recycle': settings.db_pool_recycle,
+        'pool_pre_ping': settings.db_pool_pre_ping,
+        'connect_args': {
+            'statement_cache_size': settings.db_statement_cache_size,
+            'prepared_statement_cache_size':
+                settings.db_statement_cache_size,
+        },
+    }
+
+
+def get_replica_url(replica: str) -> URL:
+    host, _, port = replica.partition(':')
+    return make_url(settings.db_string).set(
+        host=host, port=int(port) if port else None)
+
+
 async_engine: AsyncEngine = create_async_engine(
     settings.db_string,
     echo=settings.debug,
+    **get_engine_options(),
 )
+replica_engines: dict[str, AsyncEngine] = {
+    replica: create_async_engine(
+        get_replica_url(replica),
+        echo=settings.debug,
+        **{**get_engine_options(), 'pool_pre_ping': True},
+    )
+    for replica in settings.postgres_replicas
+}
@@ -0,0 +1,62 @@
+from time import perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+
+class PoolMetricsMixin:
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        event.listen(self, 'checkin', self._on_checkin)
+
+    def connect(self):
+        started_at = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            wait = perf_counter() - started_at
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        self.checkouts += 1
+        self.checked_out += 1
+        self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+        return connection
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        self.checked_out -= 1
+
+    def capacity(self) -> int | None:
+        return None
+
+    def stats(self) -> dict:
+        capacity = self.capacity()
+        attempts = self.checkouts + self.timeouts
+        return {
+            'capacity': capacity,
+            'checked_out': self.checked_out,
+            'peak_checked_out': self.peak_checked_out,
+            'utilization': self.checked_out / capacity
+            if capacity else None,
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'avg_wait': self.total_wait / attempts if attempts else 0.0,
+            'max_wait': self.max_wait,
+        }
+
+
+class InstrumentedAsyncPool(PoolMetricsMixin, AsyncAdaptedQueuePool):
+    def capacity(self) -> int | None:
+        return self.size() + max(self._max_overflow, 0)
+
+
+class InstrumentedNullPool(PoolMetricsMixin, NullPool):
+    pass
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+
+REPLICATION_LAG_QUERY = text("""
+select case
+    when not pg_is_in_recovery() then 0
+    when pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() then 0
+    else extract(epoch from now() - pg_last_xact_replay_timestamp())
+end
+""")
+
+
+class ReplicaRouter:
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replicas: dict[str, async_sessionmaker],
+        check_interval: float,
+        check_timeout: float,
+        max_lag: float,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.max_lag = max_lag
+        self.healthy = dict.fromkeys(replicas, False)
+        self.lag: dict[str, float | None] = dict.fromkeys(replicas)
+        self.reads = dict.fromkeys(replicas, 0)
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self.fallbacks = 0
+        self._next = 0
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    def choose(self, pinned: bool = False) -> str | None:
+        healthy = [name for name in self.replicas if self.healthy[name]]
+        if pinned:
+            self.pinned_reads += 1
+        if pinned or not healthy:
+            self.primary_reads += 1
+            return None
+        name = healthy[self._next % len(healthy)]
+        self._next += 1
+        self.reads[name] += 1
+        return name
+
+    async def open_session(self, pinned: bool = False) -> AsyncSession:
+        name = self.choose(pinned)
+        if name is None:
+            return self.primary()
+        session = self.replicas[name]()
+        try:
+            await session.connection()
+        except (OSError, exc.DBAPIError) as e:
+            await session.close()
+            logger.warning('replica %s failed, reading from primary: %r',
+                           name, e)
+            self.healthy[name] = False
+            self.fallbacks += 1
+            self.primary_reads += 1
+            return self.primary()
+        session.info[REPLICA] = name
+        return session
+
+    async def start(self) -> None:
+        if not self.replicas:
+            return
+        await self.check()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def check(self) -> None:
+        await asyncio.gather(*[self._check(name) for name in self.replicas])
+
+    async def _check(self, name: str) -> None:
+        try:
+            async with self.replicas[name]() as session:
+                lag = await asyncio.wait_for(
+                    session.scalar(REPLICATION_LAG_QUERY), self.check_timeout)
+        except Exception as e:
+            logger.warning('replica %s is unavailable: %r', name, e)
+            lag = None
+        self.lag[name] = float(lag) if lag is not None else None
+        self.healthy[name] = lag is not None and lag <= self.max_lag
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                await self.check()
+
+    def stats(self) -> dict:
+        return {
+            'replicas': {
+                name: {
+                    'healthy': self.healthy[name],
+                    'lag': self.lag[name],
+                    'reads': self.reads[name],
+                }
+                for name in self.replicas
+            },
+            'primary_reads': self.primary_reads,
+            'pinned_reads': self.pinned_reads,
+            'fallbacks': self.fallbacks,
+        }
+
+
+def read_from_replica(session: AsyncSession) -> bool:
+    return REPLICA in session.info
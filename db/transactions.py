@@ -0,0 +1,23 @@
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+ON_COMMIT = 'on_commit'
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    session.info.setdefault(ON_COMMIT, []).append(callback)
+
+
+@event.listens_for(Session, 'after_commit')
+def _run_on_commit(session: Session) -> None:
+    for callback in session.info.pop(ON_COMMIT, []):
+        callback()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_commit(session: Session) -> None:
+    session.info.pop(ON_COMMIT, None)
@@ -0,0 +1,12 @@
+#!/bin/sh
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+    mkdir -p "$PGDATA"
+    chown postgres "$PGDATA"
+    chmod 700 "$PGDATA"
+    until gosu postgres pg_basebackup -h "$PRIMARY_HOST" \
+        -U "$POSTGRES_USER" -D "$PGDATA" -R -X stream; do
+        sleep 1
+    done
+fi
+exec gosu postgres postgres
@@ -1,4 +1,5 @@
 import asyncio
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import pool
@@ -28,6 +29,13 @@ from db.base import Base
 from common.settings import settings
 
 target_metadata = Base.metadata
+partitioned_tables = [
+    table.name for table in target_metadata.tables.values()
+    if table.dialect_options['postgresql']['partition_by']
+]
+partition_name = re.compile(
+    rf"({'|'.join(partitioned_tables)})_(\d{{4}}_\d{{2}}|default)"
+)
 section_name = config.config_ini_section
 if section_name == 'alembic':
     config.set_main_option("sqlalchemy.url", settings.db_string)
@@ -66,15 +74,27 @@ def run_migrations_offline() -> None:
 
 def do_run_migrations(connection: Connection) -> None:
     def process_revision_directives(context, revision, directives):
-        if config.cmd_opts.autogenerate:
+        if getattr(config.cmd_opts, 'autogenerate', False):
             script = directives[0]
             if script.upgrade_ops.is_empty():
                 directives[:] = []
                 print('No changes in schema detected.')
 
+    def include_name(name, type_, parent_names):
+        if type_ == 'table':
+            return not partition_name.fullmatch(name)
+        return True
+
+    def include_object(object, name, type_, reflected, compare_to):
+        if type_ == 'foreign_key_constraint':
+            return not partition_name.fullmatch(object.referred_table.name)
+        return True
+
     context.configure(
         connection=connection, 
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
         process_revision_directives=process_revision_directives
     )
 
@@ -0,0 +1,32 @@
+"""add indexes for hot query predicates
+
+Revision ID: 50fafd4c0c87
+Revises: 1c830a28d575
+Create Date: 2026-10-18 20:19:19.669203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '50fafd4c0c87'
+down_revision: Union[str, None] = '1c830a28d575'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_owner_id_created_at_id', 'orders', ['owner_id', 'created_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_products_product_id', 'orders_products', ['product_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_products_product_id', table_name='orders_products', postgresql_concurrently=True)
+        op.drop_index('ix_orders_owner_id_created_at_id', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_created_at_id', table_name='orders', postgresql_concurrently=True)
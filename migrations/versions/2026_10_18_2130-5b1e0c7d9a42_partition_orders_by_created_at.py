@@ -0,0 +1,171 @@
+"""partition orders by created_at
+
+Revision ID: 5b1e0c7d9a42
+Revises: 067283ba138a
+Create Date: 2026-10-18 21:30:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e0c7d9a42'
+down_revision: Union[str, None] = '067283ba138a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONED_TABLES = ('orders', 'orders_products', 'orders_sellers')
+PARTITIONS_AHEAD = 3
+
+
+def _create_tables(suffix: str = '', partitioned: bool = False) -> None:
+    kw = {'postgresql_partition_by': 'RANGE (created_at)'} if partitioned else {}
+    created_at = [sa.Column('created_at', sa.DateTime(), nullable=False)] if partitioned else []
+    op.create_table(f'orders{suffix}',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('orders_id_seq')"), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='orderstatus', create_type=False), nullable=False),
+    sa.Column('item_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('received_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('total_cost', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text("TIMEZONE('utc', now())"), nullable=False),
+    **kw
+    )
+    op.create_table(f'orders_products{suffix}',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='productstatus', create_type=False), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('cost', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    *created_at,
+    **kw
+    )
+    op.create_table(f'orders_sellers{suffix}',
+    sa.Column('order_id', sa.Integer(), nullable=False),
+    sa.Column('seller_id', sa.Integer(), nullable=False),
+    sa.Column('total_cost', sa.BigInteger(), nullable=False),
+    *created_at,
+    **kw
+    )
+
+
+def _create_partitions(table: str) -> None:
+    op.execute(f"""
+        do $$
+        declare month timestamp;
+        begin
+            for month in
+                select generate_series(
+                    date_trunc('month', coalesce(
+                        (select min(created_at) from orders_unpartitioned),
+                        TIMEZONE('utc', now()))),
+                    date_trunc('month', TIMEZONE('utc', now()))
+                        + interval '{PARTITIONS_AHEAD} months',
+                    interval '1 month')
+            loop
+                execute format(
+                    'create table %I partition of {table} '
+                    'for values from (%L) to (%L)',
+                    '{table}_' || to_char(month, 'YYYY_MM'),
+                    month, month + interval '1 month');
+            end loop;
+        end $$
+    """)
+    op.execute(f"create table {table}_default partition of {table} default")
+
+
+def upgrade() -> None:
+    op.execute("alter sequence orders_id_seq owned by none")
+    for table in PARTITIONED_TABLES:
+        op.rename_table(table, f'{table}_unpartitioned')
+    _create_tables(partitioned=True)
+    for table in PARTITIONED_TABLES:
+        _create_partitions(table)
+    op.execute("""
+        insert into orders
+        (id, owner_id, status, item_count, received_count, total_cost,
+         created_at)
+        select id, owner_id, status, item_count, received_count, total_cost,
+               created_at
+        from orders_unpartitioned
+    """)
+    op.execute("""
+        insert into orders_products
+        (order_id, product_id, quantity, status, title, cost, seller_id,
+         created_at)
+        select lines.order_id, lines.product_id, lines.quantity,
+               lines.status, lines.title, lines.cost, lines.seller_id,
+               orders.created_at
+        from orders_products_unpartitioned lines
+        join orders_unpartitioned orders on orders.id = lines.order_id
+    """)
+    op.execute("""
+        insert into orders_sellers (order_id, seller_id, total_cost, created_at)
+        select sellers.order_id, sellers.seller_id, sellers.total_cost,
+               orders.created_at
+        from orders_sellers_unpartitioned sellers
+        join orders_unpartitioned orders on orders.id = sellers.order_id
+    """)
+    for table in reversed(PARTITIONED_TABLES):
+        op.drop_table(f'{table}_unpartitioned')
+    op.execute("alter sequence orders_id_seq owned by orders.id")
+    op.create_primary_key('orders_pkey', 'orders', ['id', 'created_at'])
+    op.create_foreign_key('orders_owner_id_fkey', 'orders', 'users', ['owner_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_orders_owner_id_created_at_id', 'orders', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False)
+    op.create_primary_key('orders_products_pkey', 'orders_products', ['order_id', 'product_id', 'created_at'])
+    op.create_foreign_key('orders_products_order_id_created_at_fkey', 'orders_products', 'orders', ['order_id', 'created_at'], ['id', 'created_at'], ondelete='CASCADE')
+    op.create_foreign_key('orders_products_product_id_fkey', 'orders_products', 'products', ['product_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_orders_products_product_id', 'orders_products', ['product_id'], unique=False)
+    op.create_index('ix_orders_products_seller_id_order_id', 'orders_products', ['seller_id', 'order_id'], unique=False)
+    op.create_primary_key('orders_sellers_pkey', 'orders_sellers', ['order_id', 'seller_id', 'created_at'])
+    op.create_foreign_key('orders_sellers_order_id_created_at_fkey', 'orders_sellers', 'orders', ['order_id', 'created_at'], ['id', 'created_at'], ondelete='CASCADE')
+    op.create_index('ix_orders_sellers_seller_id_created_at_order_id', 'orders_sellers', ['seller_id', 'created_at', 'order_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.execute("alter sequence orders_id_seq owned by none")
+    _create_tables('_unpartitioned')
+    op.execute("""
+        insert into orders_unpartitioned
+        (id, owner_id, status, item_count, received_count, total_cost,
+         created_at)
+        select id, owner_id, status, item_count, received_count, total_cost,
+               created_at
+        from orders
+    """)
+    op.execute("""
+        insert into orders_products_unpartitioned
+        (order_id, product_id, quantity, status, title, cost, seller_id)
+        select order_id, product_id, quantity, status, title, cost, seller_id
+        from orders_products
+    """)
+    op.execute("""
+        insert into orders_sellers_unpartitioned
+        (order_id, seller_id, total_cost)
+        select order_id, seller_id, total_cost
+        from orders_sellers
+    """)
+    for table in reversed(PARTITIONED_TABLES):
+        op.drop_table(table)
+    for table in PARTITIONED_TABLES:
+        op.rename_table(f'{table}_unpartitioned', table)
+    op.execute("alter sequence orders_id_seq owned by orders.id")
+    op.create_primary_key('orders_pkey', 'orders', ['id'])
+    op.create_foreign_key('orders_owner_id_fkey', 'orders', 'users', ['owner_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_orders_owner_id_created_at_id', 'orders', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False)
+    op.create_primary_key('orders_products_pkey', 'orders_products', ['order_id', 'product_id'])
+    op.create_foreign_key('orders_products_order_id_fkey', 'orders_products', 'orders', ['order_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('orders_products_product_id_fkey', 'orders_products', 'products', ['product_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_orders_products_product_id', 'orders_products', ['product_id'], unique=False)
+    op.create_index('ix_orders_products_seller_id_order_id', 'orders_products', ['seller_id', 'order_id'], unique=False)
+    op.create_primary_key('orders_sellers_pkey', 'orders_sellers', ['order_id', 'seller_id'])
+    op.create_foreign_key('orders_sellers_order_id_fkey', 'orders_sellers', 'orders', ['order_id'], ['id'], ondelete='CASCADE')
+    op.create_index('ix_orders_sellers_seller_id_order_id', 'orders_sellers', ['seller_id', 'order_id'], unique=False)
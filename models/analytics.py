@@ -0,0 +1,27 @@
+from datetime import date
+
+from sqlalchemy import BigInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.db import Base
+
+
+class SellerDailySales(Base):
+    __tablename__ = "seller_daily_sales"
+
+    seller_id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    revenue: Mapped[int] = mapped_column(BigInteger)
+    units: Mapped[int] = mapped_column(BigInteger)
+    orders_count: Mapped[int]
+
+
+class SellerProductDailySales(Base):
+    __tablename__ = "seller_product_daily_sales"
+
+    seller_id: Mapped[int] = mapped_column(primary_key=True)
+    day: Mapped[date] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(primary_key=True)
+    revenue: Mapped[int] = mapped_column(BigInteger)
+    units: Mapped[int] = mapped_column(BigInteger)
+    orders_count: Mapped[int]
@@ -1,12 +1,12 @@
 from datetime import datetime
 from enum import auto, StrEnum
 
-from sqlalchemy import ForeignKey
-from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, ForeignKey, ForeignKeyConstraint, Index, text
+from sqlalchemy.orm import (Mapped, mapped_column, query_expression,
+                            relationship)
 
 from db.db import Base
-from utils.models_annotations import created_at, intpk
+from utils.models_annotations import intpk
 from models.products import ProductStatus
 
 
@@ -19,32 +19,73 @@ class OrderStatus(StrEnum):
 class Order(Base):
     __tablename__ = "orders"
 
-    id: Mapped[intpk]
+    id: Mapped[intpk] = mapped_column(autoincrement=True)
     owner_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE")
     )
     status: Mapped[OrderStatus]
     content: Mapped[list["OrdersProducts"]] = relationship()
-    created_at: Mapped[created_at]
+    item_count: Mapped[int] = mapped_column(
+        default=0, server_default=text('0'))
+    received_count: Mapped[int] = mapped_column(
+        default=0, server_default=text('0'))
+    total_cost: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text('0'))
+    seller_total_cost: Mapped[int] = query_expression()
+    created_at: Mapped[datetime] = mapped_column(
+        primary_key=True,
+        server_default=text("TIMEZONE('utc', now())"),
+    )
+
+    __table_args__ = (
+        Index('ix_orders_owner_id_created_at_id',
+              'owner_id', 'created_at', 'id'),
+        Index('ix_orders_created_at_id', 'created_at', 'id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
 
 class OrdersProducts(Base):
     __tablename__ = "orders_products"
 
-    order_id: Mapped[int] = mapped_column(
-        ForeignKey("orders.id", ondelete="CASCADE"),
-        primary_key=True,
-    )
+    order_id: Mapped[int] = mapped_column(primary_key=True)
     product_id: Mapped[int] = mapped_column(
         ForeignKey("products.id", ondelete="CASCADE"),
         primary_key=True,
     )
     quantity: Mapped[int]
     status: Mapped[ProductStatus]
-    product: Mapped["Product"] = relationship()
-    cost: AssociationProxy[int] = association_proxy(
-        'product', 'cost')
-    title: AssociationProxy[int] = association_proxy(
-        'product', 'title')
-    seller_id: AssociationProxy[int] = association_proxy(
-        'product', 'seller_id')
+    title: Mapped[str]
+    cost: Mapped[int]
+    seller_id: Mapped[int]
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['order_id', 'created_at'], ['orders.id', 'orders.created_at'],
+            ondelete="CASCADE",
+        ),
+        Index('ix_orders_products_product_id', 'product_id'),
+        Index('ix_orders_products_seller_id_order_id',
+              'seller_id', 'order_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+
+class OrdersSellers(Base):
+    __tablename__ = "orders_sellers"
+
+    order_id: Mapped[int] = mapped_column(primary_key=True)
+    seller_id: Mapped[int] = mapped_column(primary_key=True)
+    total_cost: Mapped[int] = mapped_column(BigInteger)
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ['order_id', 'created_at'], ['orders.id', 'orders.created_at'],
+            ondelete="CASCADE",
+        ),
+        Index('ix_orders_sellers_seller_id_created_at_order_id',
+              'seller_id', 'created_at', 'order_id'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
@@ -0,0 +1,42 @@
+from datetime import datetime
+from enum import auto, StrEnum
+
+from sqlalchemy import Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from db.db import Base
+from utils.models_annotations import created_at, intpk
+
+
+class OutboxTopic(StrEnum):
+    PAYMENT = auto()
+    DELIVERY = auto()
+
+
+class OutboxStatus(StrEnum):
+    PENDING = auto()
+    FAILED = auto()
+
+
+class OutboxMessage(Base):
+    __tablename__ = "outbox"
+
+    id: Mapped[intpk]
+    topic: Mapped[OutboxTopic]
+    payload: Mapped[dict] = mapped_column(JSONB)
+    status: Mapped[OutboxStatus] = mapped_column(
+        default=OutboxStatus.PENDING, server_default=OutboxStatus.PENDING.name
+    )
+    attempts: Mapped[int] = mapped_column(
+        default=0, server_default=text('0'))
+    last_error: Mapped[str | None]
+    available_at: Mapped[datetime] = mapped_column(
+        server_default=text("TIMEZONE('utc', now())")
+    )
+    created_at: Mapped[created_at]
+
+    __table_args__ = (
+        Index('ix_outbox_available_at_id', 'available_at', 'id',
+              postgresql_where=text("status = 'PENDING'")),
+    )
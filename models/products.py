@@ -1,7 +1,10 @@
 from dataclasses import dataclass
+from datetime import datetime
 from enum import auto, StrEnum
 
-from sqlalchemy.orm import Mapped
+from sqlalchemy import Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column
 
 from db.db import Base
 from utils.models_annotations import created_at, intpk
@@ -24,6 +27,18 @@ class Product(Base):
     seller_id: Mapped[int]
     cost: Mapped[int]
     created_at: Mapped[created_at]
+    title_tsv: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', title)", persisted=True),
+        deferred=True,
+    )
+
+    __table_args__ = (
+        Index('ix_products_created_at_id', 'created_at', 'id'),
+        Index('ix_products_seller_id_created_at_id',
+              'seller_id', 'created_at', 'id'),
+        Index('ix_products_title_tsv', 'title_tsv', postgresql_using='gin'),
+    )
 
 
 @dataclass
@@ -34,3 +49,12 @@ class ProductInOrder:
     cost: int
     quantity: int
     status: ProductStatus
+
+
+@dataclass(frozen=True)
+class ProductInfo:
+    id: int
+    title: str
+    seller_id: int
+    cost: int
+    created_at: datetime
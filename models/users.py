@@ -1,5 +1,8 @@
+from dataclasses import dataclass
+from datetime import datetime
 from enum import auto, StrEnum
 
+from sqlalchemy import text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.db import Base
@@ -20,6 +23,12 @@ class User(Base):
     username: Mapped[str] = mapped_column(unique=True)
     hashed_password: Mapped[str]
     role: Mapped[UserRole]
+    token_version: Mapped[int] = mapped_column(
+        default=0, server_default=text('0')
+    )
+    token_version_changed_at: Mapped[datetime | None] = mapped_column(
+        index=True
+    )
     created_at: Mapped[created_at]
     orders: Mapped[list["Order"]] = relationship()
     cart: Mapped[list["Cart"]] = relationship()
@@ -29,3 +38,11 @@ class User(Base):
 pswd_hash={self.hashed_password}, \
 created_at={self.created_at.ctime()}'
         return obj
+
+
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    username: str
+    role: UserRole
+    disabled: bool
@@ -0,0 +1,125 @@
+from datetime import date, datetime
+from typing import Protocol
+
+from sqlalchemy import (BigInteger, Integer, Date, cast, column, func,
+                        literal, select, values)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.analytics import SellerDailySales, SellerProductDailySales
+from models.orders import OrdersProducts
+
+
+class IAnalyticsRepository(Protocol):
+    async def get_seller_daily_sales(
+        self, session: AsyncSession, seller_id: int,
+        date_from: date, date_to: date
+    ) -> list[SellerDailySales]:
+        ...
+
+    async def get_seller_product_daily_sales(
+        self, session: AsyncSession, seller_id: int,
+        date_from: date, date_to: date, product_id: int | None = None
+    ) -> list[SellerProductDailySales]:
+        ...
+
+
+class SQLAAnalyticsRepository:
+    async def get_seller_daily_sales(
+        self, session: AsyncSession, seller_id: int,
+        date_from: date, date_to: date
+    ) -> list[SellerDailySales]:
+        stmt = select(SellerDailySales).where(
+            SellerDailySales.seller_id == seller_id,
+            SellerDailySales.day >= date_from,
+            SellerDailySales.day <= date_to,
+        ).order_by(SellerDailySales.day)
+        response = await session.execute(stmt)
+        return response.scalars().all()
+
+    async def get_seller_product_daily_sales(
+        self, session: AsyncSession, seller_id: int,
+        date_from: date, date_to: date, product_id: int | None = None
+    ) -> list[SellerProductDailySales]:
+        stmt = select(SellerProductDailySales).where(
+            SellerProductDailySales.seller_id == seller_id,
+            SellerProductDailySales.day >= date_from,
+            SellerProductDailySales.day <= date_to,
+        )
+        if product_id is not None:
+            stmt = stmt.where(SellerProductDailySales.product_id == product_id)
+        stmt = stmt.order_by(
+            SellerProductDailySales.day, SellerProductDailySales.product_id)
+        response = await session.execute(stmt)
+        return response.scalars().all()
+
+
+def record_order_sales(order_id: int, created_at: datetime) -> list:
+    day = created_at.date()
+    lines = select(OrdersProducts).where(
+        OrdersProducts.order_id == order_id,
+        OrdersProducts.created_at == created_at,
+    ).subquery()
+    revenue = cast(lines.c.cost, BigInteger) * lines.c.quantity
+    return [
+        _upsert_sales(SellerDailySales, select(
+            lines.c.seller_id,
+            literal(day, Date),
+            func.sum(revenue),
+            func.sum(lines.c.quantity),
+            literal(1),
+        ).group_by(lines.c.seller_id).order_by(lines.c.seller_id)),
+        _upsert_sales(SellerProductDailySales, select(
+            lines.c.seller_id,
+            literal(day, Date),
+            lines.c.product_id,
+            revenue,
+            lines.c.quantity,
+            literal(1),
+        ).order_by(lines.c.seller_id, lines.c.product_id)),
+    ]
+
+
+def record_sales_adjustments(
+    adjustments: dict[tuple[int, date, int], tuple[int, int]]
+) -> list:
+    deltas = values(
+        column('seller_id', Integer),
+        column('day', Date),
+        column('product_id', Integer),
+        column('revenue', BigInteger),
+        column('units', BigInteger),
+        name='deltas',
+    ).data([(*key, *delta) for key, delta in sorted(adjustments.items())])
+    return [
+        _upsert_sales(SellerDailySales, select(
+            deltas.c.seller_id,
+            deltas.c.day,
+            func.sum(deltas.c.revenue),
+            func.sum(deltas.c.units),
+            literal(0),
+        ).group_by(deltas.c.seller_id, deltas.c.day).order_by(
+            deltas.c.seller_id, deltas.c.day)),
+        _upsert_sales(SellerProductDailySales, select(
+            deltas.c.seller_id,
+            deltas.c.day,
+            deltas.c.product_id,
+            deltas.c.revenue,
+            deltas.c.units,
+            literal(0),
+        ).order_by(deltas.c.seller_id, deltas.c.day, deltas.c.product_id)),
+    ]
+
+
+def _upsert_sales(model, rows):
+    keys = [key.name for key in model.__table__.primary_key]
+    stmt = insert(model).from_select(
+        [*keys, 'revenue', 'units', 'orders_count'], rows)
+    return stmt.on_conflict_do_update(
+        index_elements=keys,
+        set_={
+            'revenue': model.revenue + stmt.excluded.revenue,
+            'units': model.units + stmt.excluded.units,
+            'orders_count': model.orders_count + stmt.excluded.orders_count,
+        }
+    )
@@ -1,6 +1,7 @@
 from typing import Protocol
 
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import selectinload
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,7 +15,8 @@ class ICartRepository(Protocol):
         ...
 
     async def add_item(self, session: AsyncSession,
-                       user_id: int, product_id: int) -> None:
+                       user_id: int, product_id: int,
+                       quantity: int = 1) -> None:
         ...
 
     async def remove_item(self, session: AsyncSession,
@@ -38,19 +40,16 @@ class SQLACartRepository:
         return response.scalars().all()
 
     async def add_item(self, session: AsyncSession,
-                       user_id: int, product_id: int) -> None:
-        stmt = select(Cart).where(
-            Cart.user_id == user_id,
-            Cart.product_id == product_id
+                       user_id: int, product_id: int,
+                       quantity: int = 1) -> None:
+        stmt = insert(Cart).values(
+            user_id=user_id, product_id=product_id, quantity=quantity
         )
-        cart = (await session.execute(stmt)).scalar_one_or_none()
-        if cart:
-            cart.quantity += 1
-            session.add(cart)
-        else:
-            session.add(Cart(user_id=user_id, product_id=product_id,
-                             quantity=1))
-        await session.commit()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Cart.user_id, Cart.product_id],
+            set_={'quantity': Cart.quantity + stmt.excluded.quantity}
+        )
+        await session.execute(stmt)
 
     async def remove_item(self, session: AsyncSession,
                           user_id: int, product_id: int) -> None:
@@ -59,13 +58,11 @@ class SQLACartRepository:
             Cart.product_id == product_id
         )
         await session.execute(stmt)
-        await session.commit()
 
     async def clear_all(self, session: AsyncSession,
                         user_id: int) -> None:
         stmt = delete(Cart).where(Cart.user_id == user_id)
         await session.execute(stmt)
-        await session.commit()
 
     async def is_product_in_cart(self, session: AsyncSession,
                                  user_id: int, product_id: int) -> bool:
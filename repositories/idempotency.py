@@ -0,0 +1,66 @@
+from datetime import timedelta
+from typing import Protocol
+
+from sqlalchemy import func, null, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.idempotency import IdempotencyKey
+
+
+class IIdempotencyRepository(Protocol):
+    async def claim(
+        self, session: AsyncSession, user_id: int, key: str,
+        fingerprint: str, ttl: timedelta
+    ) -> bool:
+        ...
+
+    async def get(
+        self, session: AsyncSession, user_id: int, key: str
+    ) -> IdempotencyKey | None:
+        ...
+
+    async def save_response(
+        self, session: AsyncSession, user_id: int, key: str, response: dict
+    ) -> None:
+        ...
+
+
+class SQLAIdempotencyRepository:
+    async def claim(
+        self, session: AsyncSession, user_id: int, key: str,
+        fingerprint: str, ttl: timedelta
+    ) -> bool:
+        now = func.timezone('utc', func.now())
+        stmt = insert(IdempotencyKey).values(
+            user_id=user_id, key=key, fingerprint=fingerprint
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[IdempotencyKey.user_id, IdempotencyKey.key],
+            set_={'fingerprint': fingerprint, 'response': null(),
+                  'created_at': now},
+            where=or_(IdempotencyKey.created_at < now - ttl,
+                      IdempotencyKey.response.is_(None)),
+        ).returning(IdempotencyKey.user_id)
+        response = await session.execute(stmt)
+        return response.scalar_one_or_none() is not None
+
+    async def get(
+        self, session: AsyncSession, user_id: int, key: str
+    ) -> IdempotencyKey | None:
+        stmt = select(IdempotencyKey).where(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+        )
+        response = await session.execute(stmt)
+        return response.scalars().one_or_none()
+
+    async def save_response(
+        self, session: AsyncSession, user_id: int, key: str, response: dict
+    ) -> None:
+        await session.execute(
+            update(IdempotencyKey).where(
+                IdempotencyKey.user_id == user_id,
+                IdempotencyKey.key == key,
+            ).values(response=response)
+        )
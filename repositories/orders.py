@@ -1,18 +1,29 @@
+import json
+from collections import defaultdict
+from datetime import datetime
 from typing import Protocol
 
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (BigInteger, Integer, Row, String, and_, case, cast,
+                        column, insert, literal, select, tuple_, update,
+                        delete, func, values)
+from sqlalchemy.orm import contains_eager, selectinload, with_expression
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.orders import Order, OrdersProducts, OrderStatus
-from models.products import Product, ProductInOrder, ProductStatus
+from models.cart import Cart
+from models.orders import Order, OrdersProducts, OrdersSellers, OrderStatus
+from models.outbox import OutboxMessage, OutboxTopic
+from repositories.analytics import (record_order_sales,
+                                    record_sales_adjustments)
+from models.products import Product, ProductStatus
+
+
+ORDER_EVENTS_CHANNEL = 'order_events'
 
 
 class IOrderRepository(Protocol):
-    async def create(
-        self, session: AsyncSession, owner_id: int,
-        content: list[ProductInOrder]
-    ) -> int:
+    async def create_from_cart(
+        self, session: AsyncSession, owner_id: int
+    ) -> int | None:
         ...
 
     async def get_user_order(
@@ -21,10 +32,23 @@ class IOrderRepository(Protocol):
         ...
 
     async def get_user_orders(
-        self, session: AsyncSession, user_id: int
+        self, session: AsyncSession, customer_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[Order]:
         ...
 
+    async def get_user_order_summaries(
+        self, session: AsyncSession, customer_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Row]:
+        ...
+
     async def get_product_in_seller_order(
         self, session: AsyncSession, seller_id: int,
         order_id: int, product_id: int
@@ -37,7 +61,8 @@ class IOrderRepository(Protocol):
         ...
 
     async def get_seller_orders(
-        self, session: AsyncSession, seller_id: int
+        self, session: AsyncSession, seller_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None
     ) -> list[Order]:
         ...
 
@@ -47,11 +72,23 @@ class IOrderRepository(Protocol):
         ...
 
     async def update_product_status(
-        self, session: AsyncSession, seller_id: int,
+        self, session: AsyncSession,
         order_id: int, product_id: int, status: ProductStatus
     ) -> None:
         ...
 
+    async def update_products_status(
+        self, session: AsyncSession,
+        lines: list[tuple[int, int, ProductStatus]]
+    ) -> None:
+        ...
+
+    async def get_seller_lines(
+        self, session: AsyncSession, seller_id: int,
+        keys: list[tuple[int, int]]
+    ) -> set[tuple[int, int]]:
+        ...
+
     async def is_status_actual(
         self, session: AsyncSession, order_id: int
     ) -> bool:
@@ -75,128 +112,275 @@ class IOrderRepository(Protocol):
 
 
 class SQLAOrderRepository:
-    async def create(
-        self, session: AsyncSession, owner_id: int,
-        content: list[ProductInOrder]
-    ) -> int:
-        order = Order(owner_id=owner_id, status=OrderStatus.OPENED)
-        session.add(order)
-        await session.commit()
-        for item in content:
-            item_obj = OrdersProducts(
-                product_id=item.product_id,
-                order_id=order.id,
-                quantity=item.quantity,
-                status=ProductStatus.PENDING
+    async def create_from_cart(
+        self, session: AsyncSession, owner_id: int
+    ) -> int | None:
+        order_id, created_at = (await session.execute(
+            insert(Order).values(
+                owner_id=owner_id, status=OrderStatus.OPENED
+            ).returning(Order.id, Order.created_at)
+        )).one()
+        created_at_type = Order.__table__.c.created_at.type
+        cart = delete(Cart).where(Cart.user_id == owner_id).returning(
+            Cart.product_id, Cart.quantity).cte('cart')
+        stmt = insert(OrdersProducts).add_cte(cart).from_select(
+            ['order_id', 'product_id', 'quantity', 'status',
+             'title', 'cost', 'seller_id', 'created_at'],
+            select(
+                literal(order_id),
+                cart.c.product_id,
+                cart.c.quantity,
+                literal(ProductStatus.PENDING,
+                        OrdersProducts.__table__.c.status.type),
+                Product.title,
+                Product.cost,
+                Product.seller_id,
+                literal(created_at, created_at_type),
+            ).join(Product, Product.id == cart.c.product_id)
+        )
+        response = await session.execute(stmt)
+        if response.rowcount == 0:
+            return None
+        await session.execute(
+            insert(OrdersSellers).from_select(
+                ['order_id', 'seller_id', 'total_cost', 'created_at'],
+                select(
+                    literal(order_id),
+                    OrdersProducts.seller_id,
+                    func.sum(cast(OrdersProducts.quantity, BigInteger)
+                             * OrdersProducts.cost),
+                    literal(created_at, created_at_type),
+                ).where(
+                    OrdersProducts.order_id == order_id,
+                    OrdersProducts.created_at == created_at,
+                ).group_by(OrdersProducts.seller_id)
+            )
+        )
+        total_cost = (await session.execute(
+            update(Order).where(
+                Order.id == order_id, Order.created_at == created_at
+            ).values(
+                item_count=response.rowcount,
+                total_cost=select(
+                    func.sum(OrdersSellers.total_cost)
+                ).where(
+                    OrdersSellers.order_id == order_id,
+                    OrdersSellers.created_at == created_at,
+                ).scalar_subquery()
+            ).returning(Order.total_cost)
+        )).scalar_one()
+        await session.execute(
+            insert(OutboxMessage).values(
+                topic=OutboxTopic.PAYMENT,
+                payload={'order_id': order_id, 'owner_id': owner_id,
+                         'total_cost': total_cost},
             )
-            session.add(item_obj)
-        await session.commit()
-        return order.id
+        )
+        for stmt in record_order_sales(order_id, created_at):
+            await session.execute(stmt)
+        return order_id
 
     async def get_user_order(
         self, session: AsyncSession, order_id: int
     ) -> Order | None:
         stmt = select(Order).where(Order.id == order_id).options(
-            selectinload(Order.content).selectinload(OrdersProducts.product)
+            selectinload(Order.content)
         )
         response = await session.execute(stmt)
         return response.scalars().one_or_none()
 
     async def get_user_orders(
-        self, session: AsyncSession, customer_id: int
+        self, session: AsyncSession, customer_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[Order]:
-        stmt = select(Order).where(Order.owner_id == customer_id).options(
-            selectinload(Order.content).selectinload(OrdersProducts.product)
+        stmt = _select_user_orders(
+            select(Order), customer_id, cursor, status,
+            created_from, created_to
+        ).limit(limit).options(
+            selectinload(Order.content)
         )
         response = await session.execute(stmt)
         return response.scalars().all()
 
+    async def get_user_order_summaries(
+        self, session: AsyncSession, customer_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        status: OrderStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Row]:
+        stmt = _select_user_orders(
+            select(Order.id, Order.status, Order.created_at,
+                   Order.item_count, Order.total_cost),
+            customer_id, cursor, status, created_from, created_to
+        ).limit(limit)
+        response = await session.execute(stmt)
+        return response.all()
+
     async def get_product_in_seller_order(
         self, session: AsyncSession, seller_id: int,
         order_id: int, product_id: int
     ) -> OrdersProducts | None:
         stmt = select(OrdersProducts).where(
             OrdersProducts.order_id == order_id,
-            OrdersProducts.product_id == product_id
-            ).options(selectinload(OrdersProducts.product))
+            OrdersProducts.product_id == product_id,
+            OrdersProducts.seller_id == seller_id
+        )
         response = await session.execute(stmt)
-        product = response.scalars().one_or_none()
-        if product is not None and product.seller_id == seller_id:
-            return product
-
+        return response.scalars().one_or_none()
 
     async def get_seller_order(
         self, session: AsyncSession, seller_id: int, order_id: int
     ) -> Order | None:
-        stmt = select(Order).where(Order.id == order_id).options(
-            selectinload(Order.content).
-            selectinload(OrdersProducts.product)
-        )
+        stmt = _select_seller_orders(seller_id).where(Order.id == order_id)
         response = await session.execute(stmt)
-        order = response.scalars().one_or_none()
-        if order is not None:
-            for item in order.content:
-                if item.seller_id != seller_id:
-                    order.content.remove(item)
-        return order
+        return response.unique().scalars().one_or_none()
 
     async def get_seller_orders(
-        self, session: AsyncSession, seller_id: int
+        self, session: AsyncSession, seller_id: int, limit: int,
+        cursor: tuple[datetime, int] | None = None
     ) -> list[Order]:
-        order_ids = select(OrdersProducts.order_id).options(
-                selectinload(OrdersProducts.product)
-                ).where(OrdersProducts.seller_id == seller_id)
-        stmt = select(Order).where(Order.id.in_(order_ids)).options(
-            selectinload(Order.content).
-            selectinload(OrdersProducts.product)
-        )
+        page = select(OrdersSellers.order_id, OrdersSellers.created_at).where(
+            OrdersSellers.seller_id == seller_id).correlate(None)
+        if cursor is not None:
+            page = page.where(
+                OrdersSellers.created_at <= cursor[0],
+                tuple_(OrdersSellers.created_at,
+                       OrdersSellers.order_id) < tuple_(*cursor),
+            )
+        page = page.order_by(
+            OrdersSellers.created_at.desc(),
+            OrdersSellers.order_id.desc(),
+        ).limit(limit)
+        stmt = _select_seller_orders(seller_id).where(
+            tuple_(Order.id, Order.created_at).in_(page)
+        ).order_by(Order.created_at.desc(), Order.id.desc())
         response = await session.execute(stmt)
-        orders = response.scalars().all()
-        for order in orders:
-            for item in order.content:
-                if item.seller_id != seller_id:
-                    order.content.remove(item)
-        return orders
+        return response.unique().scalars().all()
 
     async def update_status(
         self, session: AsyncSession, order_id: int,
         status: OrderStatus
     ) -> None:
-        stmt = update(Order).where(Order.id == order_id).values(status=status)
-        await session.execute(stmt)
-        await session.commit()
+        stmt = update(Order).where(Order.id == order_id).values(
+            status=status).returning(Order.id, Order.owner_id, Order.status)
+        orders = (await session.execute(stmt)).all()
+        if orders:
+            await session.execute(_notify_order_events(
+                [_order_event(order) for order in orders]))
 
     async def update_product_status(
         self, session: AsyncSession,
         order_id: int, product_id: int, status: ProductStatus
     ) -> None:
+        await self.update_products_status(
+            session, [(order_id, product_id, status)])
+
+    async def update_products_status(
+        self, session: AsyncSession,
+        lines: list[tuple[int, int, ProductStatus]]
+    ) -> None:
+        if not lines:
+            return
+        new = values(
+            column('order_id', Integer),
+            column('product_id', Integer),
+            column('status', OrdersProducts.__table__.c.status.type),
+            name='new',
+        ).data(lines)
+        old = select(
+            OrdersProducts.order_id, OrdersProducts.product_id,
+            OrdersProducts.created_at, OrdersProducts.status,
+            OrdersProducts.seller_id, OrdersProducts.cost,
+            OrdersProducts.quantity,
+        ).join(new, and_(
+            new.c.order_id == OrdersProducts.order_id,
+            new.c.product_id == OrdersProducts.product_id,
+        )).order_by(
+            OrdersProducts.order_id, OrdersProducts.product_id
+        ).with_for_update(of=OrdersProducts).cte('old')
         stmt = update(OrdersProducts).where(
-            OrdersProducts.order_id == order_id,
-            OrdersProducts.product_id == product_id
-        ).values(status=status)
-        await session.execute(stmt)
-        await session.commit()
+            OrdersProducts.order_id == old.c.order_id,
+            OrdersProducts.product_id == old.c.product_id,
+            OrdersProducts.created_at == old.c.created_at,
+            new.c.order_id == old.c.order_id,
+            new.c.product_id == old.c.product_id,
+            old.c.status != new.c.status,
+        ).values(status=new.c.status).returning(
+            old.c.order_id, old.c.product_id, old.c.created_at,
+            old.c.seller_id,
+            old.c.cost, old.c.quantity, old.c.status.label('old_status'),
+            new.c.status.label('new_status'))
+        deltas = defaultdict(int)
+        adjustments = {}
+        lines = (await session.execute(stmt)).all()
+        for line in lines:
+            deltas[line.order_id, line.created_at] += (
+                int(line.new_status == ProductStatus.RECEIVED)
+                - int(line.old_status == ProductStatus.RECEIVED))
+            sign = (int(line.old_status == ProductStatus.CANCELLED)
+                    - int(line.new_status == ProductStatus.CANCELLED))
+            if sign:
+                key = (line.seller_id, line.created_at.date(),
+                       line.product_id)
+                revenue, units = adjustments.get(key, (0, 0))
+                adjustments[key] = (revenue + sign * line.cost * line.quantity,
+                                    units + sign * line.quantity)
+        if not lines:
+            return
+        orders = (await session.execute(_rollup_orders_status(deltas))).all()
+        owners = {order.id: order.owner_id for order in orders}
+        await session.execute(_notify_order_events([
+            {'type': 'line', 'order_id': line.order_id,
+             'owner_id': owners[line.order_id],
+             'seller_id': line.seller_id, 'product_id': line.product_id,
+             'status': line.new_status}
+            for line in lines
+        ] + [_order_event(order) for order in orders]))
+        if adjustments:
+            for stmt in record_sales_adjustments(adjustments):
+                await session.execute(stmt)
+
+    async def get_seller_lines(
+        self, session: AsyncSession, seller_id: int,
+        keys: list[tuple[int, int]]
+    ) -> set[tuple[int, int]]:
+        stmt = select(
+            OrdersProducts.order_id, OrdersProducts.product_id
+        ).where(
+            tuple_(OrdersProducts.order_id,
+                   OrdersProducts.product_id).in_(keys),
+            OrdersProducts.seller_id == seller_id,
+        )
+        response = await session.execute(stmt)
+        return set(response.tuples().all())
 
     async def update_content_status(
         self, session: AsyncSession,
         order_id: int, status: ProductStatus
     ) -> None:
-        stmt = update(OrdersProducts).where(
-            OrdersProducts.order_id == order_id
-        ).values(status=status)
-        await session.execute(stmt)
-        await session.commit()
+        product_ids = (await session.execute(
+            select(OrdersProducts.product_id).where(
+                OrdersProducts.order_id == order_id)
+        )).scalars().all()
+        await self.update_products_status(
+            session,
+            [(order_id, product_id, status) for product_id in product_ids]
+        )
 
     async def is_seller_product_owner(
         self, session: AsyncSession, seller_id: int,
         order_id: int, product_id: int
     ) -> bool:
-        stmt = select(OrdersProducts).where(
+        stmt = select(OrdersProducts.seller_id).where(
             OrdersProducts.order_id == order_id,
             OrdersProducts.product_id == product_id
-        ).options(selectinload(OrdersProducts.product))
+        )
         response = await session.execute(stmt)
-        return response.product.seller_id == seller_id
+        return response.scalar_one_or_none() == seller_id
 
     async def is_product_in_order(
         self, session: AsyncSession, order_id: int, product_id: int
@@ -214,3 +398,75 @@ class SQLAOrderRepository:
         stmt = select(Order).where(Order.id == id)
         response = await session.execute(stmt)
         return response.one_or_none() is not None
+
+
+def _rollup_orders_status(
+    received_deltas: dict[tuple[int, datetime], int]
+):
+    deltas = values(
+        column('order_id', Integer),
+        column('created_at', Order.__table__.c.created_at.type),
+        column('delta', Integer),
+        name='deltas',
+    ).data([(order_id, created_at, delta) for (order_id, created_at), delta
+            in received_deltas.items()])
+    received_count = Order.received_count + deltas.c.delta
+    status_type = Order.__table__.c.status.type
+    return update(Order).where(
+        Order.id == deltas.c.order_id,
+        Order.created_at == deltas.c.created_at,
+    ).values(
+        received_count=received_count,
+        status=case(
+            (Order.status == OrderStatus.CANCELLED, Order.status),
+            (received_count == Order.item_count,
+             literal(OrderStatus.COMPLETED, status_type)),
+            else_=literal(OrderStatus.OPENED, status_type),
+        )
+    ).returning(Order.id, Order.owner_id, Order.status)
+
+
+def _order_event(order: Row) -> dict:
+    return {'type': 'order', 'order_id': order.id,
+            'owner_id': order.owner_id, 'status': order.status}
+
+
+def _notify_order_events(events: list[dict]):
+    payloads = values(column('payload', String), name='events').data(
+        [(json.dumps(event),) for event in events])
+    return select(
+        func.pg_notify(ORDER_EVENTS_CHANNEL, payloads.c.payload)
+    ).select_from(payloads)
+
+
+def _select_user_orders(
+    stmt, customer_id: int, cursor: tuple[datetime, int] | None,
+    status: OrderStatus | None, created_from: datetime | None,
+    created_to: datetime | None,
+):
+    stmt = stmt.where(Order.owner_id == customer_id)
+    if cursor is not None:
+        stmt = stmt.where(
+            Order.created_at <= cursor[0],
+            tuple_(Order.created_at, Order.id) < tuple_(*cursor),
+        )
+    if status is not None:
+        stmt = stmt.where(Order.status == status)
+    if created_from is not None:
+        stmt = stmt.where(Order.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(Order.created_at < created_to)
+    return stmt.order_by(Order.created_at.desc(), Order.id.desc())
+
+
+def _select_seller_orders(seller_id: int):
+    return select(Order).join(OrdersSellers, and_(
+        OrdersSellers.order_id == Order.id,
+        OrdersSellers.created_at == Order.created_at,
+    )).join(Order.content).where(
+        OrdersSellers.seller_id == seller_id,
+        OrdersProducts.seller_id == seller_id,
+    ).options(
+        contains_eager(Order.content),
+        with_expression(Order.seller_total_cost, OrdersSellers.total_cost),
+    ).execution_options(populate_existing=True)
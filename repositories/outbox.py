@@ -0,0 +1,91 @@
+from datetime import timedelta
+from typing import Protocol
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.outbox import OutboxMessage, OutboxStatus, OutboxTopic
+
+
+class IOutboxRepository(Protocol):
+    async def add(
+        self, session: AsyncSession, topic: OutboxTopic, payload: dict
+    ) -> None:
+        ...
+
+    async def claim(
+        self, session: AsyncSession, limit: int, lease: timedelta
+    ) -> list[OutboxMessage]:
+        ...
+
+    async def complete(
+        self, session: AsyncSession, message_id: int
+    ) -> None:
+        ...
+
+    async def retry(
+        self, session: AsyncSession, message_id: int,
+        error: str, delay: timedelta
+    ) -> None:
+        ...
+
+    async def fail(
+        self, session: AsyncSession, message_id: int, error: str
+    ) -> None:
+        ...
+
+
+class SQLAOutboxRepository:
+    async def add(
+        self, session: AsyncSession, topic: OutboxTopic, payload: dict
+    ) -> None:
+        await session.execute(
+            insert(OutboxMessage).values(topic=topic, payload=payload)
+        )
+
+    async def claim(
+        self, session: AsyncSession, limit: int, lease: timedelta
+    ) -> list[OutboxMessage]:
+        now = func.timezone('utc', func.now())
+        batch = select(OutboxMessage.id).where(
+            OutboxMessage.status == OutboxStatus.PENDING,
+            OutboxMessage.available_at <= now,
+        ).order_by(OutboxMessage.available_at, OutboxMessage.id).limit(
+            limit).with_for_update(skip_locked=True)
+        stmt = update(OutboxMessage).where(
+            OutboxMessage.id.in_(batch.scalar_subquery())
+        ).values(
+            attempts=OutboxMessage.attempts + 1,
+            available_at=now + lease,
+        ).returning(OutboxMessage)
+        response = await session.execute(stmt)
+        return response.scalars().all()
+
+    async def complete(
+        self, session: AsyncSession, message_id: int
+    ) -> None:
+        await session.execute(
+            delete(OutboxMessage).where(OutboxMessage.id == message_id)
+        )
+
+    async def retry(
+        self, session: AsyncSession, message_id: int,
+        error: str, delay: timedelta
+    ) -> None:
+        await session.execute(
+            update(OutboxMessage).where(
+                OutboxMessage.id == message_id
+            ).values(
+                last_error=error,
+                available_at=func.timezone('utc', func.now()) + delay,
+            )
+        )
+
+    async def fail(
+        self, session: AsyncSession, message_id: int, error: str
+    ) -> None:
+        await session.execute(
+            update(OutboxMessage).where(
+                OutboxMessage.id == message_id
+            ).values(last_error=error, status=OutboxStatus.FAILED)
+        )
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Protocol
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class IPartitionRepository(Protocol):
+    async def get_partitions(
+        self, session: AsyncSession, table: str
+    ) -> list[str]:
+        ...
+
+    async def create_partitions(
+        self, session: AsyncSession, partitions: list[tuple[str, str]],
+        start: datetime, end: datetime
+    ) -> int:
+        ...
+
+    async def detach_partition(
+        self, session: AsyncSession, table: str, name: str
+    ) -> None:
+        ...
+
+
+class SQLAPartitionRepository:
+    async def get_partitions(
+        self, session: AsyncSession, table: str
+    ) -> list[str]:
+        stmt = text("""select partition.relname from pg_inherits
+        join pg_class partition on partition.oid = pg_inherits.inhrelid
+        where pg_inherits.inhparent = cast(:table as regclass)""")
+        response = await session.execute(stmt, {'table': table})
+        return response.scalars().all()
+
+    async def create_partitions(
+        self, session: AsyncSession, partitions: list[tuple[str, str]],
+        start: datetime, end: datetime
+    ) -> int:
+        moved = 0
+        for table, _ in reversed(partitions):
+            await session.execute(text(
+                f"create temp table {table}_moved (like {table}) "
+                "on commit drop"))
+            response = await session.execute(text(f"""with moved as (
+                delete from {table}
+                where created_at >= :start and created_at < :end
+                returning *
+            ) insert into {table}_moved select * from moved"""),
+                {'start': start, 'end': end})
+            moved += response.rowcount
+        for table, name in partitions:
+            await session.execute(text(f"""create table if not exists {name}
+            partition of {table}
+            for values from ('{start.isoformat()}') to ('{end.isoformat()}')
+            """))
+            await session.execute(
+                text(f"insert into {table} select * from {table}_moved"))
+        return moved
+
+    async def detach_partition(
+        self, session: AsyncSession, table: str, name: str
+    ) -> None:
+        await session.execute(
+            text(f"alter table {table} detach partition {name}"))
+        stmt = text("""select conname from pg_constraint
+        where conrelid = cast(:name as regclass) and contype = 'f'
+        and confrelid in (select partrelid from pg_partitioned_table)""")
+        for constraint in (
+            await session.execute(stmt, {'name': name})
+        ).scalars().all():
+            await session.execute(
+                text(f"alter table {name} drop constraint {constraint}"))
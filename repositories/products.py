@@ -1,9 +1,15 @@
+from datetime import datetime
+from functools import partial
 from typing import Protocol
 
-from sqlalchemy import select
+from sqlalchemy import func, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.products import Product
+from db.replicas import read_from_replica
+from db.transactions import on_commit
+from models.products import Product, ProductInfo
+from utils.cache import TTLCache
+from utils.pagination import SortOrder
 
 
 class IProductRepository(Protocol):
@@ -11,6 +17,10 @@ class IProductRepository(Protocol):
                      title: str, seller_id: int, cost: int) -> int:
         ...
 
+    async def create_many(self, session: AsyncSession, seller_id: int,
+                          products: list[dict]) -> list[int]:
+        ...
+
     async def get_one(self, session: AsyncSession,
                       product_id: int) -> Product:
         ...
@@ -18,22 +28,73 @@ class IProductRepository(Protocol):
     async def get_all(self, session: AsyncSession) -> list[Product]:
         ...
 
+    async def get_page(
+        self, session: AsyncSession, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        seller_id: int | None = None,
+        min_cost: int | None = None, max_cost: int | None = None,
+        order: SortOrder = SortOrder.DESC,
+    ) -> list[Product]:
+        ...
+
     async def get_seller_products(self, session: AsyncSession,
                                   seller_id: int) -> list[Product]:
         ...
 
+    async def search(self, session: AsyncSession, query: str,
+                     limit: int, offset: int = 0) -> list[Product]:
+        ...
+
 
 class SQLAProductRepository:
     async def create(self, session: AsyncSession,
                      title: str, seller_id: int, cost: int) -> int:
         product = Product(title=title, seller_id=seller_id, cost=cost)
         session.add(product)
-        await session.commit()
+        await session.flush()
         return product.id
 
+    async def create_many(self, session: AsyncSession, seller_id: int,
+                          products: list[dict]) -> list[int]:
+        if not products:
+            return []
+        stmt = insert(Product).returning(
+            Product.id, sort_by_parameter_order=True)
+        response = await session.execute(
+            stmt,
+            [{**product, 'seller_id': seller_id} for product in products]
+        )
+        return response.scalars().all()
+
     async def get_all(self, session: AsyncSession) -> Product | None:
         return (await session.execute(select(Product))).scalars().all()
 
+    async def get_page(
+        self, session: AsyncSession, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        seller_id: int | None = None,
+        min_cost: int | None = None, max_cost: int | None = None,
+        order: SortOrder = SortOrder.DESC,
+    ) -> list[Product]:
+        stmt = select(Product)
+        if seller_id is not None:
+            stmt = stmt.where(Product.seller_id == seller_id)
+        if min_cost is not None:
+            stmt = stmt.where(Product.cost >= min_cost)
+        if max_cost is not None:
+            stmt = stmt.where(Product.cost <= max_cost)
+        key = tuple_(Product.created_at, Product.id)
+        if order == SortOrder.DESC:
+            if cursor is not None:
+                stmt = stmt.where(key < tuple_(*cursor))
+            stmt = stmt.order_by(Product.created_at.desc(), Product.id.desc())
+        else:
+            if cursor is not None:
+                stmt = stmt.where(key > tuple_(*cursor))
+            stmt = stmt.order_by(Product.created_at, Product.id)
+        stmt = stmt.limit(limit)
+        return (await session.execute(stmt)).scalars().all()
+
     async def get_one(self, session: AsyncSession,
                       product_id: int) -> Product | None:
         stmt = select(Product).where(Product.id == product_id)
@@ -45,8 +106,110 @@ class SQLAProductRepository:
         stmt = select(Product).where(Product.seller_id == seller_id)
         return (await session.execute(stmt)).scalars().all()
 
+    async def search(self, session: AsyncSession, query: str,
+                     limit: int, offset: int = 0) -> list[Product]:
+        ts_query = func.websearch_to_tsquery('simple', query)
+        rank = func.ts_rank(Product.title_tsv, ts_query)
+        stmt = select(Product).where(
+            Product.title_tsv.bool_op('@@')(ts_query)
+        ).order_by(rank.desc(), Product.id).limit(limit).offset(offset)
+        return (await session.execute(stmt)).scalars().all()
+
     async def check_exists_by_id(self, session: AsyncSession,
                                  id: int) -> bool:
         stmt = select(Product).where(Product.id == id)
         response = await session.execute(stmt)
         return response.one_or_none() is not None
+
+
+class CachedProductRepository:
+    def __init__(self, repository: IProductRepository,
+                 product_cache: TTLCache,
+                 seller_products_cache: TTLCache,
+                 replica_ttl: float | None = None) -> None:
+        self.repository = repository
+        self.product_cache = product_cache
+        self.seller_products_cache = seller_products_cache
+        self.replica_ttl = replica_ttl
+
+    async def create(self, session: AsyncSession,
+                     title: str, seller_id: int, cost: int) -> int:
+        product_id = await self.repository.create(
+            session, title=title, seller_id=seller_id, cost=cost)
+        on_commit(session, partial(
+            self.invalidate, product_id=product_id, seller_id=seller_id))
+        return product_id
+
+    async def create_many(self, session: AsyncSession, seller_id: int,
+                          products: list[dict]) -> list[int]:
+        product_ids = await self.repository.create_many(
+            session, seller_id, products)
+        on_commit(session, partial(self.invalidate, seller_id=seller_id))
+        return product_ids
+
+    async def get_all(self, session: AsyncSession) -> list[Product]:
+        return await self.repository.get_all(session)
+
+    async def get_page(
+        self, session: AsyncSession, limit: int,
+        cursor: tuple[datetime, int] | None = None,
+        seller_id: int | None = None,
+        min_cost: int | None = None, max_cost: int | None = None,
+        order: SortOrder = SortOrder.DESC,
+    ) -> list[Product]:
+        return await self.repository.get_page(
+            session, limit, cursor, seller_id, min_cost, max_cost, order)
+
+    async def get_one(self, session: AsyncSession,
+                      product_id: int) -> ProductInfo | None:
+        product = self.product_cache.get(product_id)
+        if product is None:
+            product = await self.repository.get_one(session, product_id)
+            if product is None:
+                return None
+            product = _to_info(product)
+            self.product_cache.set(
+                product_id, product, self._cache_ttl(session))
+        return product
+
+    async def get_seller_products(self, session: AsyncSession,
+                                  seller_id: int) -> tuple[ProductInfo, ...]:
+        products = self.seller_products_cache.get(seller_id)
+        if products is None:
+            products = tuple(
+                _to_info(product) for product in
+                await self.repository.get_seller_products(session, seller_id)
+            )
+            self.seller_products_cache.set(
+                seller_id, products, self._cache_ttl(session))
+        return products
+
+    async def search(self, session: AsyncSession, query: str,
+                     limit: int, offset: int = 0) -> list[Product]:
+        return await self.repository.search(session, query, limit, offset)
+
+    async def check_exists_by_id(self, session: AsyncSession,
+                                 id: int) -> bool:
+        return await self.get_one(session, id) is not None
+
+    def _cache_ttl(self, session: AsyncSession) -> float | None:
+        if read_from_replica(session):
+            return self.replica_ttl
+        return None
+
+    def invalidate(self, product_id: int | None = None,
+                   seller_id: int | None = None) -> None:
+        if product_id is not None:
+            self.product_cache.pop(product_id)
+        if seller_id is not None:
+            self.seller_products_cache.pop(seller_id)
+
+
+def _to_info(product: Product) -> ProductInfo:
+    return ProductInfo(
+        id=product.id,
+        title=product.title,
+        seller_id=product.seller_id,
+        cost=product.cost,
+        created_at=product.created_at,
+    )
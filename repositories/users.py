@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Protocol
 
-from sqlalchemy import select
+from sqlalchemy import Row, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.users import User, UserRole
@@ -16,10 +17,22 @@ class IUserRepository(Protocol):
                            email: str) -> User:
         ...
 
+    async def get_by_id(self, session: AsyncSession,
+                        user_id: int) -> User | None:
+        ...
+
     async def fetch(self, session: AsyncSession,
                     username: str) -> list[User]:
         ...
 
+    async def update(self, session: AsyncSession,
+                     user_id: int, **values) -> User | None:
+        ...
+
+    async def get_revoked(self, session: AsyncSession,
+                          since: datetime) -> list[Row]:
+        ...
+
     async def check_exists_by_username(self, session: AsyncSession,
                                        username: str) -> bool:
         ...
@@ -42,7 +55,7 @@ class SQLAUserRepository:
             role=role
         )
         session.add(user)
-        await session.commit()
+        await session.flush()
         return user.id
 
     async def get_by_email(self, session: AsyncSession,
@@ -57,6 +70,12 @@ class SQLAUserRepository:
         response = await session.execute(stmt)
         return response.scalar_one_or_none()
 
+    async def get_by_id(self, session: AsyncSession,
+                        user_id: int) -> User | None:
+        stmt = select(User).where(User.id == user_id)
+        response = await session.execute(stmt)
+        return response.scalar_one_or_none()
+
     async def fetch(self, session: AsyncSession,
                     username: str | None = None) -> list[User]:
         stmt = select(User)
@@ -66,6 +85,20 @@ class SQLAUserRepository:
         results = (await session.execute(stmt)).scalars().all()
         return results
 
+    async def update(self, session: AsyncSession,
+                     user_id: int, **values) -> User | None:
+        stmt = update(User).where(User.id == user_id).values(
+            **values).returning(User)
+        user = (await session.execute(stmt)).scalar_one_or_none()
+        return user
+
+    async def get_revoked(self, session: AsyncSession,
+                          since: datetime) -> list[Row]:
+        stmt = select(
+            User.id, User.token_version, User.disabled
+        ).where(User.token_version_changed_at >= since)
+        return (await session.execute(stmt)).all()
+
     async def check_exists_by_username(self, session: AsyncSession,
                                        username: str) -> bool:
         stmt = select(User).where(User.username == username)
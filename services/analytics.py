@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta
+
+from fastapi import HTTPException
+from starlette import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.analytics import SellerDailySales, SellerProductDailySales
+from repositories.analytics import IAnalyticsRepository
+
+
+MAX_ANALYTICS_DAYS = 366
+DEFAULT_ANALYTICS_DAYS = 30
+
+
+def get_analytics_range(
+    date_from: date | None, date_to: date | None
+) -> tuple[date, date]:
+    date_to = date_to or datetime.utcnow().date()
+    date_from = date_from or date_to - timedelta(
+        days=DEFAULT_ANALYTICS_DAYS - 1)
+    if date_from > date_to:
+        error_msg = "date_from must not be after date_to"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+    if (date_to - date_from).days >= MAX_ANALYTICS_DAYS:
+        error_msg = f"range can't be longer than {MAX_ANALYTICS_DAYS} days"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+    return date_from, date_to
+
+
+async def get_seller_daily_sales(
+    analytics_repository: IAnalyticsRepository,
+    session: AsyncSession,
+    seller_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> list[SellerDailySales]:
+    return await analytics_repository.get_seller_daily_sales(
+        session, seller_id, *get_analytics_range(date_from, date_to))
+
+
+async def get_seller_product_daily_sales(
+    analytics_repository: IAnalyticsRepository,
+    session: AsyncSession,
+    seller_id: int,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    product_id: int | None = None,
+) -> list[SellerProductDailySales]:
+    return await analytics_repository.get_seller_product_daily_sales(
+        session, seller_id, *get_analytics_range(date_from, date_to),
+        product_id
+    )
@@ -1,4 +1,5 @@
 from datetime import timedelta, datetime, timezone
+from time import monotonic
 from typing import Annotated
 
 from fastapi import HTTPException, Depends, status
@@ -9,22 +10,84 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from passlib.context import CryptContext
 
 from api.deps import get_async_session, get_user_repository
-from models.users import User, UserRole
+from models.users import Principal, User, UserRole
 from repositories.users import IUserRepository
 from common.settings import settings
+from utils.cache import TTLCache
+from utils.executor import BoundedExecutor
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+password_executor = BoundedExecutor(
+    max_workers=settings.password_hash_workers,
+    max_concurrency=settings.password_hash_max_concurrency,
+    name='password-hash',
+)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+principal_cache = TTLCache(
+    maxsize=settings.principal_cache_size,
+    ttl=settings.principal_cache_ttl,
+)
+
+
+class TokenDenylist:
+    def __init__(self, refresh_interval: float,
+                 token_lifetime: timedelta) -> None:
+        self.refresh_interval = refresh_interval
+        self.token_lifetime = token_lifetime
+        self.refreshed_at = float('-inf')
+        self._versions: dict[int, int] = {}
+        self._disabled: set[int] = set()
+
+    def is_stale(self) -> bool:
+        return monotonic() - self.refreshed_at >= self.refresh_interval
+
+    async def refresh(self, repository: IUserRepository,
+                      session: AsyncSession) -> None:
+        self.refreshed_at = monotonic()
+        users = await repository.get_revoked(
+            session, datetime.utcnow() - self.token_lifetime)
+        self._versions = {user.id: user.token_version for user in users}
+        self._disabled = {user.id for user in users if user.disabled}
+
+    def revoke(self, user_id: int, token_version: int,
+               disabled: bool) -> None:
+        self._versions[user_id] = token_version
+        if disabled:
+            self._disabled.add(user_id)
+        else:
+            self._disabled.discard(user_id)
+
+    def is_disabled(self, user_id: int) -> bool:
+        return user_id in self._disabled
+
+    def is_outdated(self, user_id: int, token_version: int) -> bool:
+        return token_version < self._versions.get(user_id, 0)
+
+    def clear(self) -> None:
+        self.refreshed_at = float('-inf')
+        self._versions.clear()
+        self._disabled.clear()
+
+
+token_denylist = TokenDenylist(
+    refresh_interval=settings.token_denylist_refresh_seconds,
+    token_lifetime=timedelta(
+        minutes=int(settings.access_token_expire_minutes)),
+)
+
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_executor.run(
+        pwd_context.verify, plain_password, hashed_password
+    )
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_executor.run(pwd_context.hash, password)
 
 
 async def authenticate_user(
@@ -38,20 +101,77 @@ async def authenticate_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
+    if user.disabled:
+        raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 
+async def get_principal(
+    repository: IUserRepository,
+    session: AsyncSession,
+    username: str,
+) -> Principal | None:
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
+    user = await repository.get_by_username(session, username)
+    if user is None:
+        return None
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        role=user.role,
+        disabled=user.disabled,
+    )
+    principal_cache.set(username, principal)
+    return principal
+
+
+def invalidate_principal(user: User) -> None:
+    principal_cache.pop(user.username)
+    token_denylist.revoke(user.id, user.token_version, user.disabled)
+
+
+async def get_token_principal(
+    repository: IUserRepository,
+    session: AsyncSession,
+    payload: dict,
+) -> Principal | None:
+    if token_denylist.is_stale():
+        await token_denylist.refresh(repository, session)
+    user_id = payload["uid"]
+    if token_denylist.is_outdated(user_id, payload.get("ver", 0)):
+        return None
+    return Principal(
+        id=user_id,
+        username=payload["sub"],
+        role=UserRole(payload["role"]),
+        disabled=token_denylist.is_disabled(user_id),
+    )
+
+
+def get_token_claims(user: User) -> dict:
+    claims = {"sub": user.username}
+    if settings.self_contained_tokens:
+        claims.update({
+            "uid": user.id,
+            "role": user.role,
+            "ver": user.token_version,
+        })
+    return claims
+
+
 def get_current_active_user(required_roles: list[UserRole] | None = None):
     async def get_current_user(
         session: AsyncSession = Depends(get_async_session),
         user_repository: IUserRepository = Depends(get_user_repository),
         token: str = Depends(oauth2_scheme),
-    ):
+    ) -> Principal:
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -65,7 +185,11 @@ def get_current_active_user(required_roles: list[UserRole] | None = None):
                 raise credentials_exception
         except JWTError:
             raise credentials_exception
-        user = await user_repository.get_by_username(session, username)
+        if "uid" in payload:
+            user = await get_token_principal(
+                user_repository, session, payload)
+        else:
+            user = await get_principal(user_repository, session, username)
         if user is None:
             raise credentials_exception
         if user.disabled:
@@ -22,9 +22,10 @@ async def add_item_to_cart(
     product_repository: IProductRepository,
     user_id: int,
     product_id: int,
+    quantity: int = 1,
 ) -> None:
     await check_product_exists(session, product_repository, product_id)
-    await cart_repository.add_item(session, user_id, product_id)
+    await cart_repository.add_item(session, user_id, product_id, quantity)
 
 
 async def remove_item_from_cart(
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from functools import partial
+from hashlib import sha256
+from typing import Any, Awaitable, Callable
+
+from fastapi import HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from starlette import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.settings import settings
+from db.transactions import on_commit
+from repositories.idempotency import IIdempotencyRepository
+from utils.cache import TTLCache
+
+
+idempotency_cache = TTLCache(
+    maxsize=settings.idempotency_cache_size,
+    ttl=settings.idempotency_key_ttl,
+)
+
+
+async def get_request_fingerprint(request: Request) -> str:
+    digest = sha256(f'{request.method} {request.url.path}?'
+                    f'{request.url.query}\n'.encode())
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+async def run_idempotent(
+    repository: IIdempotencyRepository,
+    session: AsyncSession,
+    user_id: int,
+    key: str | None,
+    fingerprint: str,
+    operation: Callable[[], Awaitable[Any]],
+) -> Any:
+    if key is None:
+        return await operation()
+    stored = idempotency_cache.get((user_id, key))
+    if stored is not None:
+        return _replay(stored, fingerprint)
+    ttl = timedelta(seconds=settings.idempotency_key_ttl)
+    if not await repository.claim(session, user_id, key, fingerprint, ttl):
+        idempotency_key = await repository.get(session, user_id, key)
+        if idempotency_key is None or idempotency_key.response is None:
+            error_msg = "request with this idempotency key is in progress"
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=error_msg
+            )
+        stored = (idempotency_key.fingerprint, idempotency_key.response)
+        idempotency_cache.set((user_id, key), stored)
+        return _replay(stored, fingerprint)
+    result = await operation()
+    response = {'body': jsonable_encoder(result)}
+    await repository.save_response(session, user_id, key, response)
+    on_commit(session, partial(
+        idempotency_cache.set, (user_id, key), (fingerprint, response)))
+    return result
+
+
+def _replay(stored: tuple[str, dict], fingerprint: str) -> Any:
+    stored_fingerprint, response = stored
+    if stored_fingerprint != fingerprint:
+        error_msg = "idempotency key was used for a different request"
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=error_msg
+        )
+    return response['body']
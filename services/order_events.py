@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import asyncpg
+
+from utils.streams import iter_server_sent_events
+
+
+logger = logging.getLogger(__name__)
+
+
+class OrderEventBroker:
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        queue_size: int,
+        reconnect_delay: float,
+    ) -> None:
+        self.dsn = dsn
+        self.channel = channel
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self.connected = asyncio.Event()
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self._customers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self._sellers: dict[int, set[asyncio.Queue]] = defaultdict(set)
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @asynccontextmanager
+    async def subscribe(
+        self, customer_id: int | None = None, seller_id: int | None = None
+    ) -> AsyncIterator[asyncio.Queue]:
+        queue = asyncio.Queue(self.queue_size)
+        if customer_id is not None:
+            self._customers[customer_id].add(queue)
+        if seller_id is not None:
+            self._sellers[seller_id].add(queue)
+        try:
+            yield queue
+        finally:
+            _discard(self._customers, customer_id, queue)
+            _discard(self._sellers, seller_id, queue)
+
+    def publish(self, event: dict) -> None:
+        self.received += 1
+        queues = set(self._customers.get(event['owner_id'], ()))
+        if event['type'] == 'line':
+            queues |= self._sellers.get(event['seller_id'], set())
+        for queue in queues:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+            self.delivered += 1
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self._listen()
+            except Exception:
+                logger.exception('order events listener failed')
+            self.connected.clear()
+            if self._stopping.is_set():
+                break
+            self.reconnects += 1
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), self.reconnect_delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(self.dsn)
+        closed = asyncio.Event()
+        connection.add_termination_listener(lambda _: closed.set())
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+            self.connected.set()
+            stopping = asyncio.create_task(self._stopping.wait())
+            terminated = asyncio.create_task(closed.wait())
+            await asyncio.wait(
+                [stopping, terminated], return_when=asyncio.FIRST_COMPLETED)
+            stopping.cancel()
+            terminated.cancel()
+        finally:
+            if not connection.is_closed():
+                await connection.close()
+
+    def _on_notify(self, connection, pid: int, channel: str,
+                   payload: str) -> None:
+        try:
+            self.publish(json.loads(payload))
+        except (ValueError, KeyError):
+            logger.warning('malformed order event: %s', payload)
+
+    def stats(self) -> dict:
+        return {
+            'connected': self.connected.is_set(),
+            'customers': sum(map(len, self._customers.values())),
+            'sellers': sum(map(len, self._sellers.values())),
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'reconnects': self.reconnects,
+        }
+
+
+async def stream_order_events(
+    broker: OrderEventBroker,
+    heartbeat: float,
+    customer_id: int | None = None,
+    seller_id: int | None = None,
+) -> AsyncIterator[str]:
+    async with broker.subscribe(customer_id, seller_id) as queue:
+        async for message in iter_server_sent_events(queue, heartbeat):
+            yield message
+
+
+def _discard(subscribers: dict[int, set[asyncio.Queue]],
+             key: int | None, queue: asyncio.Queue) -> None:
+    if key is None or key not in subscribers:
+        return
+    subscribers[key].discard(queue)
+    if not subscribers[key]:
+        del subscribers[key]
@@ -1,32 +1,32 @@
+from datetime import datetime
+from functools import partial
+
 from fastapi import HTTPException
 from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.products import ProductStatus
 from models.orders import OrderStatus, Order
-from repositories.cart import ICartRepository
+from models.outbox import OutboxTopic
 from repositories.orders import IOrderRepository
-from repositories.users import IUserRepository
-from repositories.products import IProductRepository
-from services.users import user_exists
-from services.products import check_product_exists
+from repositories.outbox import IOutboxRepository
+from services.outbox import OutboxHandler
+from services.payments import PaymentClient
+from utils.pagination import decode_cursor, encode_cursor
 
 
 async def create_order(
     session: AsyncSession,
     order_repository: IOrderRepository,
-    cart_repository: ICartRepository,
     user_id: int,
 ) -> int:
-    content = await cart_repository.get_content(session, user_id)
-    if not content:
+    order_id = await order_repository.create_from_cart(session, user_id)
+    if order_id is None:
         error_msg = "empty cart"
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_msg
         )
-    order_id = await order_repository.create(session, user_id, content)
-    await cart_repository.clear_all(session, user_id)
     return order_id
 
 
@@ -58,6 +58,24 @@ async def is_product_in_order(
         )
 
 
+def _decode_cursor(cursor: str | None) -> tuple | None:
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _paginate(orders: list[Order], limit: int) -> dict:
+    next_cursor = None
+    if len(orders) > limit:
+        orders = orders[:limit]
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+    return {'items': orders, 'next_cursor': next_cursor}
+
+
 def is_valid_quantity(quantity: int) -> None:
     if quantity <= 0:
         error_msg = "quantity can't be less than or equal to 0"
@@ -73,7 +91,7 @@ async def get_seller_sale(
     ):
     order = await order_repository.get_seller_order(
         session, seller_id, order_id)
-    if order is None or order.content == []:
+    if order is None:
         error_msg = "order doesn't exist or you don't have enough rights"
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -85,10 +103,34 @@ async def get_seller_sale(
 async def get_seller_sales(
     order_repository: IOrderRepository,
     session: AsyncSession,
-    seller_id: int
-):
-    sales = await order_repository.get_seller_orders(session, seller_id)
-    return sales
+    seller_id: int,
+    limit: int,
+    cursor: str | None = None,
+) -> dict:
+    sales = await order_repository.get_seller_orders(
+        session, seller_id, limit + 1, _decode_cursor(cursor))
+    return _paginate(sales, limit)
+
+
+async def get_user_orders(
+    order_repository: IOrderRepository,
+    session: AsyncSession,
+    customer_id: int,
+    limit: int,
+    cursor: str | None = None,
+    order_status: OrderStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    summary: bool = False,
+) -> dict:
+    if summary:
+        get_orders = order_repository.get_user_order_summaries
+    else:
+        get_orders = order_repository.get_user_orders
+    orders = await get_orders(
+        session, customer_id, limit + 1, _decode_cursor(cursor),
+        order_status, created_from, created_to)
+    return _paginate(orders, limit)
 
 
 async def get_seller_sale_product(
@@ -117,43 +159,54 @@ async def update_product_status(
     product_id: int,
     status: ProductStatus,
 ):
-    product = await get_seller_sale_product(
-        orders_repository, session, seller_id, order_id, product_id)
-    await orders_repository.update_product_status(session, order_id,
-                                                  product_id, status)
-    await auto_status_updater(orders_repository, session, order_id)
+    await update_products_status(orders_repository, session, seller_id,
+                                 [(order_id, product_id, status)])
 
 
-async def auto_status_updater(
+async def update_products_status(
     orders_repository: IOrderRepository,
     session: AsyncSession,
-    order_id: int,
+    seller_id: int,
+    lines: list[tuple[int, int, ProductStatus]],
 ) -> None:
-    order = await orders_repository.get_user_order(session, order_id)
-    order_status = order.status
-    received = [product.status == ProductStatus.RECEIVED for product in order.content]
-    if order_status == OrderStatus.OPENED and all(received):
-        orders_repository.update_status(session, order_id, OrderStatus.CLOSED)
-    if order_status == OrderStatus.CANCELLED:
-        order_reposiotry.update_content_status(
-            session, order_id, ProductStatus.CANCELLED)
-
+    lines = {
+        (order_id, product_id): line_status
+        for order_id, product_id, line_status in lines
+    }
+    owned = await orders_repository.get_seller_lines(
+        session, seller_id, list(lines))
+    if len(owned) != len(lines):
+        error_msg = "product doesn't exist in that order or you don't have enough rights"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+    await orders_repository.update_products_status(
+        session, [(*key, line_status) for key, line_status in lines.items()])
 
-def calc_total_cost(order: Order) -> int:
-    return sum([product.cost * product.quantity for product in order.content])
-    
 
 async def payment_service(
-    orders_repository: IOrderRepository,
+    payment_client: PaymentClient,
+    outbox_repository: IOutboxRepository,
     session: AsyncSession,
-    order_id: int,
-) -> bool:
-    order = await orders_repository.get_user_order(session, order_id)
-    total_cost = cals_total_cost(order)
-    print(order_total_cost)
-    #  request to payment service
-    return True
-    
-
-def delivery_service() -> bool:
-    return True
+    payload: dict,
+) -> None:
+    await payment_client.pay(payload['order_id'], payload['total_cost'])
+    await outbox_repository.add(
+        session, OutboxTopic.DELIVERY, {'order_id': payload['order_id']})
+
+
+async def delivery_service(session: AsyncSession, payload: dict) -> None:
+    #  request to delivery service
+    return None
+
+
+def get_outbox_handlers(
+    payment_client: PaymentClient,
+    outbox_repository: IOutboxRepository,
+) -> dict[OutboxTopic, OutboxHandler]:
+    return {
+        OutboxTopic.PAYMENT: partial(
+            payment_service, payment_client, outbox_repository),
+        OutboxTopic.DELIVERY: delivery_service,
+    }
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import random
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models.outbox import OutboxMessage, OutboxTopic
+from repositories.outbox import IOutboxRepository
+
+
+logger = logging.getLogger(__name__)
+
+OutboxHandler = Callable[[AsyncSession, dict], Awaitable[None]]
+
+
+class OutboxWorker:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        repository: IOutboxRepository,
+        workers: int,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        lease: float,
+    ) -> None:
+        self.session_maker = session_maker
+        self.repository = repository
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease = timedelta(seconds=lease)
+        self.handlers: dict[OutboxTopic, OutboxHandler] = {}
+        self.processed = 0
+        self.retried = 0
+        self.failed = 0
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = asyncio.Event()
+
+    async def start(self, handlers: dict[OutboxTopic, OutboxHandler]) -> None:
+        self.handlers = handlers
+        self._stopping.clear()
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_once(self) -> int:
+        async with self.session_maker() as session:
+            messages = await self.repository.claim(
+                session, self.batch_size, self.lease)
+            await session.commit()
+        await asyncio.gather(*[self._process(message) for message in messages])
+        return len(messages)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception:
+                logger.exception('outbox batch failed')
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, message: OutboxMessage) -> None:
+        async with self.session_maker() as session:
+            try:
+                await self.handlers[message.topic](session, message.payload)
+                await self.repository.complete(session, message.id)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                if message.attempts >= self.max_attempts:
+                    await self.repository.fail(session, message.id, repr(e))
+                    self.failed += 1
+                else:
+                    await self.repository.retry(
+                        session, message.id, repr(e),
+                        self._backoff(message.attempts))
+                    self.retried += 1
+                await session.commit()
+                return
+            self.processed += 1
+
+    def _backoff(self, attempts: int) -> timedelta:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return timedelta(seconds=random.uniform(0, delay))
+
+    def stats(self) -> dict:
+        return {
+            'workers': len(self._tasks),
+            'processed': self.processed,
+            'retried': self.retried,
+            'failed': self.failed,
+        }
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import re
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from repositories.partitions import IPartitionRepository
+
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = ('orders', 'orders_products', 'orders_sellers')
+
+
+class PartitionMaintainer:
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        repository: IPartitionRepository,
+        months_ahead: int,
+        retention_months: int,
+        interval: float,
+    ) -> None:
+        self.session_maker = session_maker
+        self.repository = repository
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.interval = interval
+        self.created: list[str] = []
+        self.detached: list[str] = []
+        self.moved = 0
+        self.last_run: datetime | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = asyncio.Event()
+
+    async def start(self) -> None:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run_once(self, now: datetime | None = None) -> None:
+        now = now or datetime.utcnow()
+        async with self.session_maker() as session:
+            partitions = {
+                table: await self.repository.get_partitions(session, table)
+                for table in PARTITIONED_TABLES
+            }
+            for months in range(self.months_ahead + 1):
+                start = _month_start(now, months)
+                missing = [
+                    (table, _partition_name(table, start))
+                    for table in PARTITIONED_TABLES
+                    if _partition_name(table, start) not in partitions[table]
+                ]
+                if not missing:
+                    continue
+                first = PARTITIONED_TABLES.index(missing[0][0])
+                moved = await self.repository.create_partitions(
+                    session,
+                    [(table, _partition_name(table, start))
+                     for table in PARTITIONED_TABLES[first:]],
+                    start, _month_start(now, months + 1))
+                await session.commit()
+                if moved:
+                    logger.warning(
+                        'moved %s rows into %s', moved,
+                        ', '.join(name for _, name in missing))
+                self.moved += moved
+                self.created.extend(name for _, name in missing)
+            if self.retention_months:
+                cutoff = _month_start(now, -self.retention_months)
+                expired = {}
+                for table in reversed(PARTITIONED_TABLES):
+                    for name in await self.repository.get_partitions(
+                        session, table
+                    ):
+                        month = _partition_month(table, name)
+                        if month is not None and month < cutoff:
+                            expired.setdefault(month, []).append(
+                                (table, name))
+                for month in sorted(expired):
+                    for table, name in expired[month]:
+                        await self.repository.detach_partition(
+                            session, table, name)
+                    await session.commit()
+                    self.detached.extend(name for _, name in expired[month])
+        self.last_run = now
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception('partition maintenance failed')
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            'last_run': self.last_run,
+            'created': self.created[-10:],
+            'detached': self.detached[-10:],
+            'moved_from_default': self.moved,
+        }
+
+
+def _month_start(moment: datetime, months: int = 0) -> datetime:
+    index = moment.year * 12 + moment.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def _partition_name(table: str, month: datetime) -> str:
+    return f'{table}_{month:%Y_%m}'
+
+
+def _partition_month(table: str, name: str) -> datetime | None:
+    match = re.fullmatch(rf'{table}_(\d{{4}})_(\d{{2}})', name)
+    if match is None:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1)
@@ -0,0 +1,136 @@
+import asyncio
+import random
+from time import perf_counter
+
+import httpx
+
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class PaymentError(Exception):
+    pass
+
+
+class PaymentUnavailableError(PaymentError):
+    pass
+
+
+class PaymentClient:
+    def __init__(
+        self,
+        base_url: str,
+        limits: httpx.Limits,
+        timeout: float,
+        deadline: float,
+        max_concurrency: int,
+        retries: int,
+        backoff_base: float,
+        breaker: CircuitBreaker,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.base_url = base_url
+        self.limits = limits
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.breaker = breaker
+        self.transport = transport
+        self.waiting = 0
+        self.running = 0
+        self.calls = 0
+        self.attempts = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: httpx.AsyncClient | None = None
+
+    async def open(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=self.limits,
+            timeout=self.timeout,
+            transport=self.transport,
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def pay(self, order_id: int, amount: int) -> None:
+        started_at = perf_counter()
+        self.calls += 1
+        try:
+            async with asyncio.timeout(self.deadline):
+                self.waiting += 1
+                try:
+                    await self._semaphore.acquire()
+                finally:
+                    self.waiting -= 1
+                self.running += 1
+                try:
+                    await self._pay(order_id, amount)
+                finally:
+                    self.running -= 1
+                    self._semaphore.release()
+        except TimeoutError:
+            self.errors += 1
+            raise PaymentUnavailableError('payment deadline exceeded')
+        except PaymentError:
+            self.errors += 1
+            raise
+        finally:
+            self.total_latency += perf_counter() - started_at
+
+    async def _pay(self, order_id: int, amount: int) -> None:
+        for attempt in range(self.retries + 1):
+            if attempt:
+                await asyncio.sleep(
+                    random.uniform(0, self.backoff_base * 2 ** attempt))
+            try:
+                self.breaker.check()
+            except CircuitOpenError as e:
+                raise PaymentUnavailableError(str(e))
+            self.attempts += 1
+            try:
+                async with asyncio.timeout(self.timeout):
+                    response = await self._client.post(
+                        '/payments',
+                        json={'order_id': order_id, 'amount': amount},
+                        headers={'Idempotency-Key': f'order-{order_id}'},
+                    )
+            except (httpx.TransportError, TimeoutError) as e:
+                self.breaker.record_failure()
+                error = repr(e)
+                continue
+            except asyncio.CancelledError:
+                self.breaker.record_failure()
+                raise
+            if response.status_code in RETRYABLE_STATUSES:
+                self.breaker.record_failure()
+                error = f'payment provider responded {response.status_code}'
+                continue
+            self.breaker.record_success()
+            if response.is_error:
+                raise PaymentError(
+                    f'payment rejected with {response.status_code}')
+            return
+        raise PaymentUnavailableError(error)
+
+    def stats(self) -> dict:
+        return {
+            'max_concurrency': self.max_concurrency,
+            'queue_depth': self.waiting,
+            'running': self.running,
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'errors': self.errors,
+            'avg_latency': self.total_latency / self.calls
+            if self.calls else 0.0,
+            'breaker': self.breaker.stats(),
+        }
@@ -1,8 +1,16 @@
+from typing import AsyncIterator
+
 from fastapi import HTTPException
+from pydantic import ValidationError
 from starlette import status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.schemas.products import ProductCreateSchema
+from common.settings import settings
 from repositories.products import IProductRepository
+from utils.streams import (ROW_PARSERS, InvalidRow, StreamTooLarge,
+                           limit_stream)
+from utils.pagination import SortOrder, decode_cursor, encode_cursor
 
 
 async def check_product_exists(
@@ -27,3 +35,95 @@ async def create_product(
 ) -> int:
     product_id = await repository.create(session, title, cost)
     return product_id
+
+
+async def get_products_page(
+    session: AsyncSession,
+    repository: IProductRepository,
+    limit: int,
+    cursor: str | None = None,
+    seller_id: int | None = None,
+    min_cost: int | None = None,
+    max_cost: int | None = None,
+    order: SortOrder = SortOrder.DESC,
+) -> dict:
+    try:
+        decoded_cursor = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    products = await repository.get_page(
+        session, limit + 1, decoded_cursor, seller_id,
+        min_cost, max_cost, order
+    )
+    next_cursor = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(products[-1].created_at, products[-1].id)
+    return {'items': products, 'next_cursor': next_cursor}
+
+
+async def import_products(
+    session: AsyncSession,
+    repository: IProductRepository,
+    seller_id: int,
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+) -> dict:
+    parser = ROW_PARSERS.get(content_type)
+    if parser is None:
+        error_msg = "unsupported content type"
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=error_msg
+        )
+    product_ids, products, errors = [], [], []
+    try:
+        row_number = 0
+        rows = parser(limit_stream(chunks, settings.bulk_import_max_bytes))
+        async for row in rows:
+            if row_number >= settings.bulk_import_max_rows:
+                error_msg = "too many rows"
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=error_msg
+                )
+            if isinstance(row, InvalidRow):
+                errors.append({'row': row_number, 'error': row.error})
+            else:
+                try:
+                    products.append(
+                        ProductCreateSchema.model_validate(row).model_dump())
+                except ValidationError as e:
+                    errors.append({
+                        'row': row_number,
+                        'error': _format_validation_error(e),
+                    })
+            row_number += 1
+            if len(products) >= settings.bulk_import_chunk_size:
+                product_ids.extend(
+                    await repository.create_many(session, seller_id, products))
+                products = []
+    except StreamTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    product_ids.extend(
+        await repository.create_many(session, seller_id, products))
+    return {'ids': product_ids, 'errors': errors}
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(map(str, item['loc']))}: {item['msg']}"
+        if item['loc'] else item['msg']
+        for item in error.errors()
+    )
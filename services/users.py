@@ -1,10 +1,14 @@
+from functools import partial
+
 from fastapi import HTTPException
 from starlette import status
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.transactions import on_commit
 from models.users import User, UserRole
 from repositories.users import IUserRepository
-from services.auth import get_password_hash
+from services.auth import get_password_hash, invalidate_principal
 
 
 async def create_user(
@@ -16,11 +20,36 @@ async def create_user(
 ) -> User:
     await is_valid_username(repository, session, username)
     user = await repository.create(
-        session, username, get_password_hash(password), role
+        session, username, await get_password_hash(password), role
     )
     return user
 
 
+async def update_user(
+    repository: IUserRepository,
+    session: AsyncSession,
+    user_id: int,
+    **values,
+) -> User:
+    if not values:
+        error_msg = "nothing to update"
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+    user = await repository.update(
+        session, user_id, token_version=User.token_version + 1,
+        token_version_changed_at=func.timezone('utc', func.now()), **values)
+    if user is None:
+        error_msg = "user doesn't exist"
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=error_msg
+        )
+    on_commit(session, partial(invalidate_principal, user))
+    return user
+
+
 async def user_exists(
     user_repository: IUserRepository,
     session: AsyncSession,
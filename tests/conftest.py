@@ -3,16 +3,19 @@ from datetime import datetime
 import os
 from typing import Callable
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.testclient import TestClient
 import pytest
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy import text
 
 from api.app import create_app
-from api.deps import get_async_session
+from api.deps import (get_async_session, get_read_session, product_cache,
+                      seller_products_cache)
 from common.settings import settings
 from models.users import UserRole
+from services.auth import principal_cache, token_denylist
+from services.idempotency import idempotency_cache
 
 
 CLEAN_TABLES = [
@@ -20,6 +23,9 @@ CLEAN_TABLES = [
     'products',
     'orders',
     'orders_products',
+    'outbox',
+    'seller_daily_sales',
+    'seller_product_daily_sales',
 ]
 
 
@@ -32,12 +38,10 @@ def event_loop():
 
 @pytest.fixture(scope="session", autouse=True)
 def run_migrations():
-    os.system('alembic -n test revision --autogenerate\
-            -m "test running migration"')
     os.system('alembic -n test upgrade head')
 
 
-async def _get_test_async_session():
+async def _get_test_async_session(request: Request):
     try:
         test_async_engine = create_async_engine(
             settings.db_test_string,
@@ -46,6 +50,7 @@ async def _get_test_async_session():
         session_maker = async_sessionmaker(
                 test_async_engine, expire_on_commit=False)
         test_async_session = session_maker()
+        request.state.session = test_async_session
         yield test_async_session
     finally:
         await test_async_session.close()
@@ -55,6 +60,7 @@ async def _get_test_async_session():
 def app():
     app = create_app()
     app.dependency_overrides[get_async_session] = _get_test_async_session
+    app.dependency_overrides[get_read_session] = _get_test_async_session
     return app
 
 
@@ -77,6 +83,11 @@ async def clean_tables(get_async_sessionmaker):
             for table_to_clean in CLEAN_TABLES:
                 await session.execute(
                     text(f"truncate {table_to_clean} cascade"))
+    principal_cache.clear()
+    token_denylist.clear()
+    product_cache.clear()
+    seller_products_cache.clear()
+    idempotency_cache.clear()
 
 
 @pytest.fixture
@@ -192,23 +203,43 @@ async def create_order_in_db(get_async_sessionmaker) -> int:
     async def create_order_in_db(user_id: int, content: list['Product']):
         async with get_async_sessionmaker() as session:
             async with session.begin():
+                now = datetime.utcnow()
                 order_id = (await session.execute(
                     text("""insert into orders (owner_id, status, created_at)
                     values (:owner_id, :status, :now)
                     returning orders.id"""),
                     {'owner_id': user_id,
                      'status': 'OPENED',
-                     'now': datetime.utcnow()})
+                     'now': now})
                 ).scalar()
                 await session.execute(
-                    text("""insert into orders_products 
-                    (order_id, product_id, quantity, status)
-                    values (:order_id, :product_id, :quantity, :status)"""),
+                    text("""insert into orders_products
+                    (order_id, product_id, quantity, status,
+                    title, cost, seller_id, created_at)
+                    select :order_id, id, :quantity, :status,
+                    title, cost, seller_id, :now
+                    from products where id = :product_id"""),
                     [{'order_id': order_id,
+                      'now': now,
                       'product_id': item['id'],
                       'quantity': item['quantity'],
                       'status': 'PENDING'} for item in content]
                 )
+                await session.execute(
+                    text("""insert into orders_sellers
+                    (order_id, seller_id, total_cost, created_at)
+                    select :order_id, seller_id, sum(quantity::bigint * cost), :now
+                    from orders_products where order_id = :order_id
+                    group by seller_id"""),
+                    {'order_id': order_id, 'now': now}
+                )
+                await session.execute(
+                    text("""update orders set item_count = :item_count,
+                    total_cost = (select sum(total_cost) from orders_sellers
+                    where order_id = :order_id)
+                    where id = :order_id"""),
+                    {'order_id': order_id, 'item_count': len(content)}
+                )
                 return order_id
 
     return create_order_in_db
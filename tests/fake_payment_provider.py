@@ -0,0 +1,59 @@
+import asyncio
+import os
+import random
+
+from fastapi import FastAPI, Request, Response, status
+from pydantic import BaseModel
+from starlette.requests import ClientDisconnect
+
+
+class FakePaymentProviderConfig(BaseModel):
+    latency: float = 0.0
+    error_rate: float = 0.0
+
+
+class FakePaymentProvider:
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = status.HTTP_503_SERVICE_UNAVAILABLE,
+                 failures: int = 0) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.failures = failures
+        self.calls = 0
+        self.payments: list[tuple[str, dict]] = []
+        self.app = FastAPI()
+        self.app.add_api_route(
+            '/payments', self.create_payment, methods=['POST'])
+        self.app.add_api_route(
+            '/_config', self.configure, methods=['PUT'])
+        self.app.add_api_route('/_stats', self.get_stats, methods=['GET'])
+
+    async def create_payment(self, request: Request) -> Response:
+        self.calls += 1
+        try:
+            payment = await request.json()
+        except ClientDisconnect:
+            return Response(status_code=499)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failures or random.random() < self.error_rate:
+            self.failures = max(0, self.failures - 1)
+            return Response(status_code=self.error_status)
+        self.payments.append((request.headers['Idempotency-Key'], payment))
+        return Response(status_code=status.HTTP_201_CREATED)
+
+    async def configure(self, config: FakePaymentProviderConfig) -> None:
+        self.latency = config.latency
+        self.error_rate = config.error_rate
+        self.calls = 0
+
+    async def get_stats(self) -> dict:
+        return {'calls': self.calls, 'payments': len(self.payments)}
+
+
+def create_app() -> FastAPI:
+    return FakePaymentProvider(
+        latency=float(os.environ.get('FAKE_PAYMENT_LATENCY', 0)),
+        error_rate=float(os.environ.get('FAKE_PAYMENT_ERROR_RATE', 0)),
+    ).app
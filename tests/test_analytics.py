@@ -0,0 +1,105 @@
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from models.products import ProductStatus
+from models.users import UserRole
+from repositories.orders import SQLAOrderRepository
+
+
+async def test_seller_analytics_follow_checkout_and_cancellation(
+    app: FastAPI,
+    client: TestClient,
+    get_async_sessionmaker,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('title', 100, seller_id)
+    item1_id = await create_product_in_db('title1', 200, seller_id)
+    other_item_id = await create_product_in_db('other', 300, seller_id + 1)
+    create_order_url = app.url_path_for('create_order_handler')
+    await add_item_to_cart_in_db(customer_id, item_id, 2)
+    await add_item_to_cart_in_db(customer_id, item1_id, 1)
+    await add_item_to_cart_in_db(customer_id, other_item_id, 1)
+    order_id = client.post(url=create_order_url,
+                           headers=customer_auth_headers).json()['id']
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    client.post(url=create_order_url, headers=customer_auth_headers)
+
+    daily_url = app.url_path_for('get_seller_daily_sales_handler')
+    products_url = app.url_path_for('get_seller_product_daily_sales_handler')
+    resp = client.get(url=daily_url, headers=seller_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    [day] = resp.json()
+    assert (day['revenue'], day['units'], day['orders_count']) == (500, 4, 2)
+    resp = client.get(url=products_url, headers=seller_auth_headers)
+    assert {row['product_id']: (row['revenue'], row['units'],
+                                row['orders_count'])
+            for row in resp.json()} == {
+        item_id: (300, 3, 2), item1_id: (200, 1, 1)}
+
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            await SQLAOrderRepository().update_products_status(
+                session, [(order_id, item_id, ProductStatus.CANCELLED)])
+    resp = client.get(url=daily_url, headers=seller_auth_headers)
+    [day] = resp.json()
+    assert (day['revenue'], day['units'], day['orders_count']) == (300, 2, 2)
+    resp = client.get(url=products_url, headers=seller_auth_headers,
+                      params={'product_id': item_id})
+    assert [(row['revenue'], row['units']) for row in resp.json()] == [
+        (100, 1)]
+
+
+async def test_seller_analytics_invalid_range(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+):
+    _, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    daily_url = app.url_path_for('get_seller_daily_sales_handler')
+    resp = client.get(url=daily_url, headers=seller_auth_headers, params={
+        'date_from': '2024-02-01', 'date_to': '2024-01-01'})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    resp = client.get(url=daily_url, headers=seller_auth_headers, params={
+        'date_from': '2022-01-01', 'date_to': '2024-01-01'})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_seller_analytics_revenue_beyond_int4(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('title', 2 ** 31 - 1, seller_id)
+    create_order_url = app.url_path_for('create_order_handler')
+    for _ in range(2):
+        await add_item_to_cart_in_db(customer_id, item_id, 1)
+        resp = client.post(url=create_order_url,
+                           headers=customer_auth_headers)
+        assert resp.status_code == status.HTTP_200_OK
+    daily_url = app.url_path_for('get_seller_daily_sales_handler')
+    resp = client.get(url=daily_url, headers=seller_auth_headers)
+    [day] = resp.json()
+    assert day['revenue'] == 2 * (2 ** 31 - 1)
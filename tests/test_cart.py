@@ -1,7 +1,12 @@
+import asyncio
+
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 
 from models.users import UserRole
+from repositories.cart import SQLACartRepository
 
 
 async def test_get_cart_success(
@@ -94,3 +99,132 @@ async def test_delete_item_from_cart_success(
     cart = await get_cart_from_db(customer_id)
     assert len(cart) == 1
     assert cart[0]['product_id'] == item1_id
+
+
+async def test_add_item_to_cart_with_quantity(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    get_cart_from_db,
+):
+    cart_add_item_url = app.url_path_for('add_item_to_cart_handler')
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    product_id = await create_product_in_db('title', 100, 1)
+    resp = client.post(
+        url=cart_add_item_url,
+        json={'product_id': product_id, 'quantity': 3},
+        headers=customer_auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.post(
+        url=cart_add_item_url,
+        json={'product_id': product_id, 'quantity': 2},
+        headers=customer_auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    cart = await get_cart_from_db(customer_id)
+    assert cart[0]['quantity'] == 5
+    resp = client.post(
+        url=cart_add_item_url,
+        json={'product_id': product_id, 'quantity': 0},
+        headers=customer_auth_headers
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_add_item_to_cart_concurrent(
+    create_test_user_and_get_token,
+    create_product_in_db,
+    get_cart_from_db,
+    get_async_sessionmaker,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    product_id = await create_product_in_db('title', 100, 1)
+    cart_repository = SQLACartRepository()
+
+    async def add_item():
+        async with get_async_sessionmaker() as session:
+            async with session.begin():
+                await cart_repository.add_item(
+                    session, customer_id, product_id)
+
+    await asyncio.gather(*[add_item() for _ in range(10)])
+    cart = await get_cart_from_db(customer_id)
+    assert cart[0]['quantity'] == 10
+
+
+async def test_add_item_to_cart_idempotent_retry(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    get_cart_from_db,
+):
+    cart_add_item_url = app.url_path_for('add_item_to_cart_handler')
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    product_id = await create_product_in_db('title', 100, 1)
+    headers = {**customer_auth_headers, 'Idempotency-Key': 'add-1'}
+    for _ in range(2):
+        resp = client.post(
+            url=cart_add_item_url,
+            json={'product_id': product_id},
+            headers=headers
+        )
+        assert resp.status_code == status.HTTP_200_OK
+    cart = await get_cart_from_db(customer_id)
+    assert cart[0]['quantity'] == 1
+    resp = client.post(
+        url=cart_add_item_url,
+        json={'product_id': product_id, 'quantity': 3},
+        headers=headers
+    )
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_add_item_to_cart_commits_once(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    get_cart_from_db,
+):
+    cart_add_item_url = app.url_path_for('add_item_to_cart_handler')
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    product_id = await create_product_in_db('title', 100, 1)
+    commits = []
+
+    def count_commit(conn):
+        commits.append(conn)
+
+    event.listen(Engine, 'commit', count_commit)
+    try:
+        resp = client.post(
+            url=cart_add_item_url,
+            json={'product_id': product_id},
+            headers={**customer_auth_headers, 'Idempotency-Key': 'add-1'}
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        resp = client.post(
+            url=cart_add_item_url,
+            json={'product_id': 0},
+            headers=customer_auth_headers
+        )
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        event.remove(Engine, 'commit', count_commit)
+    assert len(commits) == 1
+    cart = await get_cart_from_db(customer_id)
+    assert [item['quantity'] for item in cart] == [1]
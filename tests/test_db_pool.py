@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from common.settings import settings
+from db.db import get_engine_options
+from db.pool import InstrumentedNullPool
+
+
+async def test_pool_reports_utilization_and_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, 'db_pool_size', 1)
+    monkeypatch.setattr(settings, 'db_max_overflow', 0)
+    monkeypatch.setattr(settings, 'db_pool_timeout', 0.1)
+    engine = create_async_engine(
+        settings.db_test_string, **get_engine_options())
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text('select 1'))
+            assert engine.pool.stats()['utilization'] == 1.0
+            with pytest.raises(exc.TimeoutError):
+                async with engine.connect():
+                    pass
+        stats = engine.pool.stats()
+        assert stats['capacity'] == 1
+        assert stats['checked_out'] == 0
+        assert stats['peak_checked_out'] == 1
+        assert stats['checkouts'] == 1
+        assert stats['timeouts'] == 1
+        assert stats['max_wait'] >= 0.1
+    finally:
+        await engine.dispose()
+
+
+async def test_pgbouncer_mode_disables_statement_caches(monkeypatch):
+    monkeypatch.setattr(settings, 'db_pgbouncer', True)
+    engine = create_async_engine(
+        settings.db_test_string, **get_engine_options())
+    try:
+        assert isinstance(engine.pool, InstrumentedNullPool)
+        for _ in range(2):
+            async with engine.connect() as conn:
+                await conn.execute(text('select 1'))
+                prepared = (await conn.execute(text(
+                    'select name from pg_prepared_statements'))).scalars()
+                assert all(name.startswith('__asyncpg_')
+                           for name in prepared)
+        assert engine.pool.stats()['checkouts'] == 2
+    finally:
+        await engine.dispose()
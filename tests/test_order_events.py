@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import make_url
+
+from common.settings import settings
+from models.users import UserRole
+from repositories.orders import ORDER_EVENTS_CHANNEL
+from services.order_events import OrderEventBroker, stream_order_events
+
+
+@pytest.fixture
+async def order_event_broker():
+    broker = OrderEventBroker(
+        make_url(settings.db_test_string).set(
+            drivername='postgresql').render_as_string(hide_password=False),
+        ORDER_EVENTS_CHANNEL, queue_size=10, reconnect_delay=0.1,
+    )
+    await broker.start()
+    await asyncio.wait_for(broker.connected.wait(), 5)
+    yield broker
+    await broker.stop()
+
+
+async def test_status_update_notifies_customer_and_seller(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+    order_event_broker,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    other_seller_id, _ = await create_test_user_and_get_token(
+        name='other_seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('own', 100, seller_id)
+    other_item_id = await create_product_in_db('other', 100, other_seller_id)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1},
+                      {'id': other_item_id, 'quantity': 1}])
+    async with (
+        order_event_broker.subscribe(customer_id=customer_id) as customer,
+        order_event_broker.subscribe(seller_id=seller_id) as seller,
+        order_event_broker.subscribe(seller_id=other_seller_id) as other,
+    ):
+        update_url = app.url_path_for(
+            'update_product_status_handler',
+            order_id=order_id, product_id=item_id
+        )
+        resp = client.patch(url=update_url, json={'status': 'shipping'},
+                            headers=seller_auth_headers)
+        assert resp.status_code == status.HTTP_200_OK
+        line_event = {
+            'type': 'line', 'order_id': order_id, 'owner_id': customer_id,
+            'seller_id': seller_id, 'product_id': item_id,
+            'status': 'shipping',
+        }
+        assert await asyncio.wait_for(customer.get(), 5) == line_event
+        assert await asyncio.wait_for(customer.get(), 5) == {
+            'type': 'order', 'order_id': order_id, 'owner_id': customer_id,
+            'status': 'opened',
+        }
+        assert await asyncio.wait_for(seller.get(), 5) == line_event
+        assert seller.empty()
+        assert other.empty()
+    assert order_event_broker.stats()['customers'] == 0
+
+
+async def test_stream_order_events_formats_server_sent_events():
+    broker = OrderEventBroker(
+        'postgresql://unused', ORDER_EVENTS_CHANNEL,
+        queue_size=1, reconnect_delay=0,
+    )
+    stream = stream_order_events(broker, heartbeat=0.01, seller_id=7)
+    assert await anext(stream) == ': heartbeat\n\n'
+    broker.publish({'type': 'line', 'owner_id': 1, 'seller_id': 7})
+    broker.publish({'type': 'line', 'owner_id': 1, 'seller_id': 7,
+                    'status': 'shipping'})
+    assert await anext(stream) == (
+        'event: line\ndata: {"type": "line", "owner_id": 1, '
+        '"seller_id": 7, "status": "shipping"}\n\n')
+    assert broker.dropped == 1
+    await stream.aclose()
+    assert broker.stats()['sellers'] == 0
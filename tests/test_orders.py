@@ -1,7 +1,11 @@
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
+from models.products import ProductStatus
 from models.users import UserRole
+from repositories.orders import SQLAOrderRepository
+from services import idempotency as services_idempotency
 
 
 async def test_create_order_success(
@@ -92,12 +96,325 @@ async def test_get_my_orders_success(
     get_order_url = app.url_path_for('get_my_orders_handler')
     resp = client.get(url=get_order_url, headers=customer_auth_headers)
     assert resp.status_code == status.HTTP_200_OK
-    body = resp.json()
+    body = resp.json()['items']
     assert len(body) == 2
-    assert body[0]['id'] == order_id
-    assert body[1]['id'] == order1_id
+    assert body[0]['id'] == order1_id
+    assert body[1]['id'] == order_id
     assert len(body[0]['content']) == 1
     assert len(body[1]['content']) == 1
-    assert body[0]['content'][0]['id'] == item_id
-    assert body[0]['content'][0]['quantity'] == 1
-    assert body[1]['content'][0]['quantity'] == 2
+    assert body[1]['content'][0]['id'] == item_id
+    assert body[1]['content'][0]['quantity'] == 1
+    assert body[0]['content'][0]['quantity'] == 2
+
+
+async def test_get_my_orders_pagination_and_filters(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    order_ids = [
+        await create_order_in_db(customer_id, [{'id': item_id, 'quantity': 1}])
+        for _ in range(3)
+    ]
+    get_orders_url = app.url_path_for('get_my_orders_handler')
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'limit': 2})
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert [order['id'] for order in body['items']] == order_ids[:0:-1]
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'limit': 2, 'cursor': body['next_cursor']})
+    body = resp.json()
+    assert [order['id'] for order in body['items']] == order_ids[:1]
+    assert body['next_cursor'] is None
+
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'status': 'completed'})
+    assert resp.json()['items'] == []
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'created_to': '2000-01-01T00:00:00'})
+    assert resp.json()['items'] == []
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'cursor': 'invalid'})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_get_my_orders_summary(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    item1_id = await create_product_in_db('title1', 200, 1)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 2},
+                      {'id': item1_id, 'quantity': 1}]
+    )
+    get_orders_url = app.url_path_for('get_my_orders_handler')
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'summary': True})
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert body['next_cursor'] is None
+    assert len(body['items']) == 1
+    summary = body['items'][0]
+    assert summary['id'] == order_id
+    assert summary['status'] == 'opened'
+    assert summary['item_count'] == 2
+    assert summary['total_cost'] == 400
+    assert 'content' not in summary
+
+
+async def test_create_order_moves_cart_content(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+    get_cart_from_db,
+    get_order_from_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    item1_id = await create_product_in_db('title1', 200, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    await add_item_to_cart_in_db(customer_id, item1_id, 3)
+    create_order_url = app.url_path_for('create_order_handler')
+    resp = client.post(
+        url=create_order_url,
+        headers=customer_auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    order = await get_order_from_db(resp.json()['id'])
+    assert order['owner_id'] == customer_id
+    assert order['status'] == 'OPENED'
+    content = {item['product_id']: item for item in order['content']}
+    assert content[item_id]['quantity'] == 1
+    assert content[item1_id]['quantity'] == 3
+    assert content[item1_id]['status'] == 'PENDING'
+    assert await get_cart_from_db(customer_id) == []
+    resp = client.post(
+        url=create_order_url,
+        headers=customer_auth_headers
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_create_order_persists_totals(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('title', 100, seller_id)
+    item1_id = await create_product_in_db('title1', 200, seller_id + 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 2)
+    await add_item_to_cart_in_db(customer_id, item1_id, 3)
+    create_order_url = app.url_path_for('create_order_handler')
+    resp = client.post(url=create_order_url, headers=customer_auth_headers)
+    order_id = resp.json()['id']
+
+    get_order_url = app.url_path_for('get_order_handler', order_id=order_id)
+    resp = client.get(url=get_order_url, headers=customer_auth_headers)
+    assert resp.json()['total_cost'] == 800
+    get_orders_url = app.url_path_for('get_my_orders_handler')
+    resp = client.get(url=get_orders_url, headers=customer_auth_headers,
+                      params={'summary': True})
+    summary = resp.json()['items'][0]
+    assert summary['item_count'] == 2
+    assert summary['total_cost'] == 800
+    sale_url = app.url_path_for('get_seller_sale_handler', order_id=order_id)
+    resp = client.get(url=sale_url, headers=seller_auth_headers)
+    assert resp.json()['total_cost'] == 200
+
+
+async def test_create_order_totals_beyond_int4(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 2 ** 31 - 1, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 3)
+    create_order_url = app.url_path_for('create_order_handler')
+    resp = client.post(url=create_order_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    get_order_url = app.url_path_for('get_order_handler',
+                                     order_id=resp.json()['id'])
+    resp = client.get(url=get_order_url, headers=customer_auth_headers)
+    assert resp.json()['total_cost'] == 3 * (2 ** 31 - 1)
+
+async def test_order_keeps_product_snapshot(
+    app: FastAPI,
+    client: TestClient,
+    get_async_sessionmaker,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    create_order_url = app.url_path_for('create_order_handler')
+    resp = client.post(url=create_order_url, headers=customer_auth_headers)
+    order_id = resp.json()['id']
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            await session.execute(
+                text("update products set title = 'new', cost = 500"))
+
+    get_order_url = app.url_path_for('get_order_handler', order_id=order_id)
+    resp = client.get(url=get_order_url, headers=customer_auth_headers)
+    content = resp.json()['content']
+    assert content[0]['title'] == 'title'
+    assert content[0]['cost'] == 100
+    assert resp.json()['total_cost'] == 100
+
+
+async def test_order_status_follows_received_lines(
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+    get_order_from_db,
+    get_async_sessionmaker,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    item1_id = await create_product_in_db('title1', 200, 1)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1},
+                      {'id': item1_id, 'quantity': 1}]
+    )
+    order_repository = SQLAOrderRepository()
+
+    async def update(product_id: int, status: ProductStatus) -> dict:
+        async with get_async_sessionmaker() as session:
+            async with session.begin():
+                await order_repository.update_product_status(
+                    session, order_id, product_id, status)
+        return await get_order_from_db(order_id)
+
+    order = await update(item_id, ProductStatus.RECEIVED)
+    assert (order['status'], order['received_count']) == ('OPENED', 1)
+    order = await update(item_id, ProductStatus.RECEIVED)
+    assert (order['status'], order['received_count']) == ('OPENED', 1)
+    order = await update(item1_id, ProductStatus.RECEIVED)
+    assert (order['status'], order['received_count']) == ('COMPLETED', 2)
+    order = await update(item_id, ProductStatus.DELIVERED)
+    assert (order['status'], order['received_count']) == ('OPENED', 1)
+
+
+async def test_create_order_idempotent_retry(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+    get_async_sessionmaker,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    create_order_url = app.url_path_for('create_order_handler')
+    headers = {**customer_auth_headers, 'Idempotency-Key': 'order-1'}
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+    order_id = resp.json()['id']
+    services_idempotency.idempotency_cache.clear()
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['id'] == order_id
+    async with get_async_sessionmaker() as session:
+        orders_count = (await session.execute(
+            text('select count(*) from orders'))).scalar()
+    assert orders_count == 1
+
+
+async def test_create_order_failure_releases_idempotency_key(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    create_order_url = app.url_path_for('create_order_handler')
+    headers = {**customer_auth_headers, 'Idempotency-Key': 'order-1'}
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    item_id = await create_product_in_db('title', 100, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+
+
+async def test_create_order_reclaims_abandoned_idempotency_key(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+    get_async_sessionmaker,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            await session.execute(text(
+                """insert into idempotency_keys (user_id, key, fingerprint)
+                values (:user_id, 'order-1', 'stale')"""),
+                {'user_id': customer_id})
+    item_id = await create_product_in_db('title', 100, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 1)
+    create_order_url = app.url_path_for('create_order_handler')
+    headers = {**customer_auth_headers, 'Idempotency-Key': 'order-1'}
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+    order_id = resp.json()['id']
+    resp = client.post(url=create_order_url, headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['id'] == order_id
@@ -0,0 +1,150 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from models.users import UserRole
+from repositories.outbox import SQLAOutboxRepository
+from services.orders import get_outbox_handlers
+from services.outbox import OutboxWorker
+from services.payments import PaymentClient
+from utils.circuit_breaker import CircuitBreaker
+from tests.fake_payment_provider import FakePaymentProvider
+
+
+@pytest.fixture
+async def create_outbox_worker(get_async_sessionmaker):
+    payment_clients = []
+
+    async def create_outbox_worker(provider: FakePaymentProvider,
+                                   max_attempts: int = 3):
+        outbox_repository = SQLAOutboxRepository()
+        worker = OutboxWorker(
+            get_async_sessionmaker, outbox_repository,
+            workers=2, batch_size=10, poll_interval=0.01,
+            max_attempts=max_attempts, backoff_base=0, backoff_max=0,
+            lease=60,
+        )
+        payment_client = PaymentClient(
+            'http://payments', limits=httpx.Limits(), timeout=1, deadline=1,
+            max_concurrency=10, retries=0, backoff_base=0,
+            breaker=CircuitBreaker(failure_threshold=10, recovery_timeout=1),
+            transport=httpx.ASGITransport(app=provider.app),
+        )
+        await payment_client.open()
+        payment_clients.append(payment_client)
+        worker.handlers = get_outbox_handlers(
+            payment_client, outbox_repository)
+        return worker
+
+    yield create_outbox_worker
+    for payment_client in payment_clients:
+        await payment_client.close()
+
+
+@pytest.fixture
+async def get_outbox_from_db(get_async_sessionmaker):
+    async def get_outbox_from_db() -> list[dict]:
+        async with get_async_sessionmaker() as session:
+            messages = await session.execute(
+                text("select * from outbox order by id"))
+            return [message._asdict() for message in messages.all()]
+    return get_outbox_from_db
+
+
+@pytest.fixture
+async def create_order_via_api(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    add_item_to_cart_in_db,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    item_id = await create_product_in_db('title', 100, 1)
+    await add_item_to_cart_in_db(customer_id, item_id, 3)
+    resp = client.post(url=app.url_path_for('create_order_handler'),
+                       headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    return resp.json()['id']
+
+
+async def test_checkout_writes_payment_message(
+    create_order_via_api,
+    get_outbox_from_db,
+):
+    messages = await get_outbox_from_db()
+    assert len(messages) == 1
+    assert messages[0]['topic'] == 'PAYMENT'
+    assert messages[0]['status'] == 'PENDING'
+    assert messages[0]['payload']['order_id'] == create_order_via_api
+    assert messages[0]['payload']['total_cost'] == 300
+
+
+async def test_outbox_worker_retries_and_chains_delivery(
+    create_order_via_api,
+    create_outbox_worker,
+    get_outbox_from_db,
+):
+    provider = FakePaymentProvider(failures=1)
+    worker = await create_outbox_worker(provider)
+
+    assert await worker.run_once() == 1
+    messages = await get_outbox_from_db()
+    assert messages[0]['attempts'] == 1
+    assert '503' in messages[0]['last_error']
+    assert provider.payments == []
+
+    assert await worker.run_once() == 1
+    assert provider.payments == [(
+        f'order-{create_order_via_api}',
+        {'order_id': create_order_via_api, 'amount': 300},
+    )]
+    messages = await get_outbox_from_db()
+    assert [message['topic'] for message in messages] == ['DELIVERY']
+
+    assert await worker.run_once() == 1
+    assert await get_outbox_from_db() == []
+    assert worker.stats()['processed'] == 2
+    assert worker.stats()['retried'] == 1
+
+
+async def test_outbox_worker_gives_up_after_max_attempts(
+    create_order_via_api,
+    create_outbox_worker,
+    get_outbox_from_db,
+):
+    worker = await create_outbox_worker(
+        FakePaymentProvider(error_rate=1), max_attempts=2)
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 1
+    assert await worker.run_once() == 0
+    messages = await get_outbox_from_db()
+    assert messages[0]['status'] == 'FAILED'
+    assert messages[0]['attempts'] == 2
+    assert worker.stats()['failed'] == 1
+
+
+async def test_outbox_worker_pool_drains_messages(
+    create_order_via_api,
+    create_outbox_worker,
+    get_outbox_from_db,
+):
+    provider = FakePaymentProvider()
+    worker = await create_outbox_worker(provider)
+    await worker.start(worker.handlers)
+    try:
+        for _ in range(100):
+            if not await get_outbox_from_db():
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        await worker.stop()
+    assert await get_outbox_from_db() == []
+    assert len(provider.payments) == 1
@@ -0,0 +1,264 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from models.users import UserRole
+from repositories.orders import SQLAOrderRepository
+from repositories.partitions import SQLAPartitionRepository
+from services.partitions import PARTITIONED_TABLES, PartitionMaintainer
+
+
+FUTURE = datetime(2040, 1, 15)
+PAST_MONTHS = ('2000_01', '2000_02', '2000_03')
+
+
+class InMemoryPartitionRepository:
+    def __init__(self, partitions: dict[str, list[str]]) -> None:
+        self.partitions = partitions
+        self.detached = []
+
+    async def get_partitions(self, session, table):
+        return list(self.partitions[table])
+
+    async def create_partitions(self, session, partitions, start, end):
+        for table, name in partitions:
+            if name not in self.partitions[table]:
+                self.partitions[table].append(name)
+        return 0
+
+    async def detach_partition(self, session, table, name):
+        self.partitions[table].remove(name)
+        self.detached.append(name)
+
+
+class NullSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def commit(self):
+        return None
+
+
+@pytest.fixture
+async def future_partitions(get_async_sessionmaker):
+    maintainer = PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=1, retention_months=0, interval=0,
+    )
+    await maintainer.run_once(FUTURE)
+    yield maintainer
+    async with get_async_sessionmaker() as session:
+        for table in reversed(PARTITIONED_TABLES):
+            for month in ('2040_01', '2040_02'):
+                await session.execute(text(
+                    f'alter table {table} detach partition {table}_{month}'))
+                await session.execute(text(f'drop table {table}_{month}'))
+        await session.commit()
+
+
+@pytest.fixture
+async def past_partitions(get_async_sessionmaker):
+    yield
+    repository = SQLAPartitionRepository()
+    async with get_async_sessionmaker() as session:
+        for table in reversed(PARTITIONED_TABLES):
+            partitions = await repository.get_partitions(session, table)
+            for month in PAST_MONTHS:
+                if f'{table}_{month}' in partitions:
+                    await repository.detach_partition(
+                        session, table, f'{table}_{month}')
+        for table in reversed(PARTITIONED_TABLES):
+            for month in PAST_MONTHS:
+                await session.execute(
+                    text(f'drop table if exists {table}_{month}'))
+        await session.commit()
+
+
+async def _create_past_order(session, created_at: datetime) -> int:
+    owner_id = (await session.execute(text(
+        """insert into users (username, hashed_password, role, disabled)
+        values ('customer', 'hash', 'CUSTOMER', false) returning id"""
+    ))).scalar()
+    product_id = (await session.execute(text(
+        """insert into products (title, seller_id, cost)
+        values ('title', 1, 100) returning id"""
+    ))).scalar()
+    order_id = (await session.execute(text(
+        """insert into orders (owner_id, status, created_at)
+        values (:owner_id, 'OPENED', :created_at) returning id"""),
+        {'owner_id': owner_id, 'created_at': created_at})).scalar()
+    await session.execute(text(
+        """insert into orders_products (order_id, product_id, quantity,
+        status, title, cost, seller_id, created_at)
+        values (:order_id, :product_id, 1, 'PENDING', 'title', 100, 1,
+        :created_at)"""),
+        {'order_id': order_id, 'product_id': product_id,
+         'created_at': created_at})
+    await session.execute(text(
+        """insert into orders_sellers (order_id, seller_id, total_cost,
+        created_at) values (:order_id, 1, 100, :created_at)"""),
+        {'order_id': order_id, 'created_at': created_at})
+    await session.commit()
+    return order_id
+
+
+async def test_partition_maintainer_creates_future_partitions(
+    get_async_sessionmaker,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    future_partitions,
+):
+    assert future_partitions.created == [
+        f'{table}_{month}' for month in ('2040_01', '2040_02')
+        for table in PARTITIONED_TABLES
+    ]
+    await future_partitions.run_once(FUTURE)
+    assert len(future_partitions.created) == 6
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer', role=UserRole.CUSTOMER)
+    product_id = await create_product_in_db('title', 100, 1)
+    async with get_async_sessionmaker() as session:
+        await session.execute(text(
+            """insert into cart (user_id, product_id, quantity)
+            values (:user_id, :product_id, 1)"""),
+            {'user_id': customer_id, 'product_id': product_id})
+        await session.execute(text(
+            """alter table orders alter column created_at
+            set default '2040-01-20'"""))
+        try:
+            order_id = await SQLAOrderRepository().create_from_cart(
+                session, customer_id)
+        finally:
+            await session.execute(text(
+                """alter table orders alter column created_at
+                set default TIMEZONE('utc', now())"""))
+            await session.commit()
+        partitions = (await session.execute(text(
+            """select tableoid::regclass::text from orders where id = :id
+            union all
+            select tableoid::regclass::text from orders_products
+            where order_id = :id"""), {'id': order_id})).scalars().all()
+        assert partitions == ['orders_2040_01', 'orders_products_2040_01']
+        orders = await SQLAOrderRepository().get_user_orders(
+            session, customer_id, 20,
+            created_from=datetime(2040, 1, 1),
+            created_to=datetime(2040, 2, 1),
+        )
+        assert [order.id for order in orders] == [order_id]
+
+
+async def test_partition_maintainer_detaches_expired_children_first():
+    partitions = {
+        table: [f'{table}_2039_11', f'{table}_2039_12', f'{table}_default']
+        for table in PARTITIONED_TABLES
+    }
+    repository = InMemoryPartitionRepository(partitions)
+    maintainer = PartitionMaintainer(
+        NullSession, repository, months_ahead=1, retention_months=1,
+        interval=0,
+    )
+    await maintainer.run_once(FUTURE)
+    assert repository.detached == [
+        'orders_sellers_2039_11', 'orders_products_2039_11', 'orders_2039_11'
+    ]
+    assert partitions['orders'] == [
+        'orders_2039_12', 'orders_default', 'orders_2040_01', 'orders_2040_02'
+    ]
+
+
+async def test_partition_maintainer_detaches_month_with_orders(
+    get_async_sessionmaker,
+    past_partitions,
+):
+    await PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=0, retention_months=0, interval=0,
+    ).run_once(datetime(2000, 1, 15))
+    async with get_async_sessionmaker() as session:
+        order_id = await _create_past_order(session, datetime(2000, 1, 20))
+    maintainer = PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=0, retention_months=1, interval=0,
+    )
+    await maintainer.run_once(datetime(2000, 3, 15))
+    assert maintainer.detached == [
+        'orders_sellers_2000_01', 'orders_products_2000_01', 'orders_2000_01'
+    ]
+    async with get_async_sessionmaker() as session:
+        for table in PARTITIONED_TABLES:
+            assert f'{table}_2000_01' not in (
+                await SQLAPartitionRepository().get_partitions(session, table))
+        assert (await session.execute(text(
+            'select count(*) from orders where id = :id'),
+            {'id': order_id})).scalar() == 0
+        assert (await session.execute(text(
+            """select count(*) from orders_2000_01
+            join orders_products_2000_01 lines on lines.order_id = id
+            join orders_sellers_2000_01 sellers on sellers.order_id = id"""
+        ))).scalar() == 1
+        assert (await session.execute(text(
+            """select count(*) from pg_constraint
+            where confrelid = 'orders'::regclass
+            and conrelid in ('orders_products_2000_01'::regclass,
+                             'orders_sellers_2000_01'::regclass)"""
+        ))).scalar() == 0
+
+
+async def test_partition_maintainer_moves_rows_out_of_default_partition(
+    get_async_sessionmaker,
+    past_partitions,
+):
+    async with get_async_sessionmaker() as session:
+        order_id = await _create_past_order(session, datetime(2000, 2, 20))
+    maintainer = PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=0, retention_months=0, interval=0,
+    )
+    await maintainer.run_once(datetime(2000, 2, 15))
+    assert maintainer.created == [
+        f'{table}_2000_02' for table in PARTITIONED_TABLES]
+    assert maintainer.stats()['moved_from_default'] == 3
+    async with get_async_sessionmaker() as session:
+        partitions = (await session.execute(text(
+            """select tableoid::regclass::text from orders where id = :id
+            union all
+            select tableoid::regclass::text from orders_products
+            where order_id = :id
+            union all
+            select tableoid::regclass::text from orders_sellers
+            where order_id = :id"""), {'id': order_id})).scalars().all()
+    assert partitions == [
+        'orders_2000_02', 'orders_products_2000_02', 'orders_sellers_2000_02']
+
+
+async def test_partition_maintainer_keeps_child_rows_of_missing_parent(
+    get_async_sessionmaker,
+    past_partitions,
+):
+    async with get_async_sessionmaker() as session:
+        for table in PARTITIONED_TABLES[1:]:
+            await session.execute(text(
+                f"""create table {table}_2000_02 partition of {table}
+                for values from ('2000-02-01') to ('2000-03-01')"""))
+        order_id = await _create_past_order(session, datetime(2000, 2, 20))
+    maintainer = PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=0, retention_months=0, interval=0,
+    )
+    await maintainer.run_once(datetime(2000, 2, 15))
+    assert maintainer.created == ['orders_2000_02']
+    async with get_async_sessionmaker() as session:
+        partitions = (await session.execute(text(
+            """select tableoid::regclass::text from orders where id = :id
+            union all
+            select tableoid::regclass::text from orders_products
+            where order_id = :id
+            union all
+            select tableoid::regclass::text from orders_sellers
+            where order_id = :id"""), {'id': order_id})).scalars().all()
+    assert partitions == [
+        'orders_2000_02', 'orders_products_2000_02', 'orders_sellers_2000_02']
@@ -0,0 +1,86 @@
+import asyncio
+from time import perf_counter
+
+import httpx
+import pytest
+
+from services.payments import (PaymentClient, PaymentError,
+                               PaymentUnavailableError)
+from utils.circuit_breaker import CircuitBreaker, CircuitState
+from tests.fake_payment_provider import FakePaymentProvider
+
+
+@pytest.fixture
+async def create_payment_client():
+    payment_clients = []
+
+    async def create_payment_client(
+        provider: FakePaymentProvider,
+        timeout: float = 1,
+        deadline: float = 1,
+        retries: int = 2,
+        failure_threshold: int = 10,
+        recovery_timeout: float = 60,
+    ) -> PaymentClient:
+        payment_client = PaymentClient(
+            'http://payments', limits=httpx.Limits(), timeout=timeout,
+            deadline=deadline, max_concurrency=5, retries=retries,
+            backoff_base=0,
+            breaker=CircuitBreaker(failure_threshold, recovery_timeout),
+            transport=httpx.ASGITransport(app=provider.app),
+        )
+        await payment_client.open()
+        payment_clients.append(payment_client)
+        return payment_client
+
+    yield create_payment_client
+    for payment_client in payment_clients:
+        await payment_client.close()
+
+
+async def test_pay_retries_transient_errors(create_payment_client):
+    provider = FakePaymentProvider(failures=2)
+    payment_client = await create_payment_client(provider)
+    await payment_client.pay(1, 100)
+    assert provider.calls == 3
+    assert provider.payments == [('order-1', {'order_id': 1, 'amount': 100})]
+    assert payment_client.breaker.state == CircuitState.CLOSED
+
+
+async def test_pay_does_not_retry_rejections(create_payment_client):
+    provider = FakePaymentProvider(failures=1, error_status=402)
+    payment_client = await create_payment_client(provider)
+    with pytest.raises(PaymentError):
+        await payment_client.pay(1, 100)
+    assert provider.calls == 1
+    assert payment_client.breaker.failures == 0
+
+
+async def test_pay_respects_deadline(create_payment_client):
+    provider = FakePaymentProvider(latency=5)
+    payment_client = await create_payment_client(
+        provider, timeout=0.1, deadline=0.15)
+    started_at = perf_counter()
+    with pytest.raises(PaymentUnavailableError):
+        await payment_client.pay(1, 100)
+    assert perf_counter() - started_at < 1
+    assert provider.calls == 2
+
+
+async def test_circuit_breaker_fails_fast_and_recovers(create_payment_client):
+    provider = FakePaymentProvider(error_rate=1)
+    payment_client = await create_payment_client(
+        provider, retries=0, failure_threshold=3, recovery_timeout=0.1)
+    for _ in range(3):
+        with pytest.raises(PaymentUnavailableError):
+            await payment_client.pay(1, 100)
+    assert payment_client.breaker.state == CircuitState.OPEN
+    with pytest.raises(PaymentUnavailableError):
+        await payment_client.pay(1, 100)
+    assert provider.calls == 3
+
+    provider.error_rate = 0
+    await asyncio.sleep(0.1)
+    await payment_client.pay(1, 100)
+    assert provider.calls == 4
+    assert payment_client.breaker.state == CircuitState.CLOSED
@@ -5,7 +5,10 @@ from time import sleep
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
 
+from api.deps import product_cache, seller_products_cache
+from common.settings import settings
 from models.users import UserRole
+from utils import streams
 
 
 async def test_create_product_success(
@@ -79,3 +82,254 @@ async def test_get_product_fail_not_exists(
     resp = client.get(url=product_url)
     assert resp.status_code == status.HTTP_404_NOT_FOUND
     assert resp.json()['detail'] == "product doesn't exist"
+
+
+async def test_get_products_paginated(
+    app: FastAPI,
+    client: TestClient,
+    create_product_in_db,
+):
+    product_ids = [
+        await create_product_in_db(f'title{i}', 100 * (i + 1), 1)
+        for i in range(3)
+    ]
+    products_url = app.url_path_for('get_products')
+    resp = client.get(url=products_url, params={'limit': 2})
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert [item['id'] for item in body['items']] == product_ids[:0:-1]
+    assert body['next_cursor'] is not None
+    resp = client.get(
+        url=products_url,
+        params={'limit': 2, 'cursor': body['next_cursor']}
+    )
+    body = resp.json()
+    assert [item['id'] for item in body['items']] == product_ids[:1]
+    assert body['next_cursor'] is None
+
+
+async def test_get_products_filtered(
+    app: FastAPI,
+    client: TestClient,
+    create_product_in_db,
+):
+    await create_product_in_db('cheap', 100, 1)
+    expected_id = await create_product_in_db('middle', 200, 1)
+    await create_product_in_db('expensive', 300, 1)
+    await create_product_in_db('other seller', 200, 2)
+    products_url = app.url_path_for('get_products')
+    resp = client.get(
+        url=products_url,
+        params={'seller_id': 1, 'min_cost': 150, 'max_cost': 250,
+                'order': 'asc'}
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert [item['id'] for item in body['items']] == [expected_id]
+
+
+async def test_get_products_fail_invalid_cursor(
+    app: FastAPI,
+    client: TestClient,
+):
+    products_url = app.url_path_for('get_products')
+    resp = client.get(url=products_url, params={'cursor': 'invalid'})
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert resp.json()['detail'] == 'invalid cursor'
+
+
+async def test_get_product_served_from_cache(
+    app: FastAPI,
+    client: TestClient,
+    create_product_in_db,
+):
+    product_id = await create_product_in_db('title', 100, 1)
+    product_url = app.url_path_for('get_product', product_id=product_id)
+    resp = client.get(url=product_url)
+    assert resp.status_code == status.HTTP_200_OK
+    hits = product_cache.hits
+    resp = client.get(url=product_url)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['title'] == 'title'
+    assert product_cache.hits - hits == 2
+
+
+async def test_seller_products_cache_invalidated_on_create(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+):
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    seller_products_url = app.url_path_for('get_seller_products_handler',
+                                           seller_id=seller_id)
+    create_product_url = app.url_path_for('create_product')
+    resp = client.get(url=seller_products_url)
+    assert resp.json() == []
+    resp = client.post(
+        url=create_product_url,
+        json={'title': 'product', 'cost': 100},
+        headers=seller_auth_headers,
+    )
+    product_id = resp.json()['id']
+    resp = client.get(url=seller_products_url)
+    assert [item['id'] for item in resp.json()] == [product_id]
+    hits = seller_products_cache.hits
+    resp = client.get(url=seller_products_url)
+    assert [item['id'] for item in resp.json()] == [product_id]
+    assert seller_products_cache.hits - hits == 1
+
+
+async def test_search_products_ranked(
+    app: FastAPI,
+    client: TestClient,
+    create_product_in_db,
+):
+    await create_product_in_db('green apple', 100, 1)
+    red_apple_id = await create_product_in_db('red apple red', 100, 1)
+    await create_product_in_db('banana', 100, 1)
+    search_url = app.url_path_for('search_products')
+    resp = client.get(url=search_url, params={'q': 'apple'})
+    assert resp.status_code == status.HTTP_200_OK
+    assert len(resp.json()) == 2
+    resp = client.get(url=search_url, params={'q': 'red apple'})
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert [item['id'] for item in body] == [red_apple_id]
+    resp = client.get(url=search_url, params={'q': 'apple', 'limit': 1,
+                                              'offset': 1})
+    assert len(resp.json()) == 1
+
+
+async def test_create_products_bulk_json(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    get_product_from_db,
+):
+    seller_id, auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    bulk_url = app.url_path_for('create_products_bulk')
+    resp = client.post(
+        url=bulk_url,
+        json=[
+            {'title': 'first', 'cost': 100},
+            {'title': 'invalid', 'cost': -1},
+            {'title': 'second', 'cost': 200},
+            {'title': 'too expensive', 'cost': 2 ** 31},
+        ],
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert len(body['ids']) == 2
+    assert [error['row'] for error in body['errors']] == [1, 3]
+    product_in_db = await get_product_from_db(body['ids'][1])
+    assert product_in_db[1] == 'second'
+    assert product_in_db[2] == seller_id
+
+
+async def test_create_products_bulk_csv_and_ndjson(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    get_product_from_db,
+):
+    _, auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    bulk_url = app.url_path_for('create_products_bulk')
+    resp = client.post(
+        url=bulk_url,
+        content='title,cost\r\nfirst,100\r\n"second, quoted",200\r\n'
+                '"third\r\nmultiline ""quoted""",300\r\n',
+        headers={**auth_headers, 'Content-Type': 'text/csv'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['errors'] == []
+    assert [(await get_product_from_db(product_id))[1]
+            for product_id in resp.json()['ids']] == [
+        'first', 'second, quoted', 'third\nmultiline "quoted"']
+    resp = client.post(
+        url=bulk_url,
+        content='title,cost\n12" monitor,100\n"unterminated,100\nlamp,5\n',
+        headers={**auth_headers, 'Content-Type': 'text/csv'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert [(await get_product_from_db(product_id))[1]
+            for product_id in resp.json()['ids']] == ['12" monitor']
+    assert resp.json()['errors'] == [
+        {'row': 1, 'error': 'unterminated quoted field in csv'}]
+    resp = client.post(
+        url=bulk_url,
+        content='{"title": "first", "cost": 100}\nnot json\n',
+        headers={**auth_headers, 'Content-Type': 'application/x-ndjson'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert len(resp.json()['ids']) == 1
+    [error] = resp.json()['errors']
+    assert error['row'] == 1
+    assert error['error'].startswith('invalid json: ')
+
+
+async def test_create_products_bulk_in_chunks(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    get_product_from_db,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, 'bulk_import_chunk_size', 2)
+    _, auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    bulk_url = app.url_path_for('create_products_bulk')
+    resp = client.post(
+        url=bulk_url,
+        content=''.join(
+            f'{{"title": "product {i}", "cost": {i + 1}}}\n'
+            for i in range(5)
+        ),
+        headers={**auth_headers, 'Content-Type': 'application/x-ndjson'},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    ids = resp.json()['ids']
+    assert len(ids) == 5
+    assert [(await get_product_from_db(product_id))[1]
+            for product_id in ids] == [f'product {i}' for i in range(5)]
+
+
+async def test_create_products_bulk_too_large(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    monkeypatch,
+):
+    _, auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    bulk_url = app.url_path_for('create_products_bulk')
+    monkeypatch.setattr(settings, 'bulk_import_max_bytes', 64)
+    resp = client.post(
+        url=bulk_url,
+        json=[{'title': f'product {i}', 'cost': 100} for i in range(10)],
+        headers=auth_headers,
+    )
+    assert resp.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert resp.json()['detail'] == 'request body too large'
+    monkeypatch.setattr(settings, 'bulk_import_max_bytes', 1024)
+    monkeypatch.setattr(streams, 'MAX_LINE_LENGTH', 16)
+    resp = client.post(
+        url=bulk_url,
+        content='x' * 100,
+        headers={**auth_headers, 'Content-Type': 'application/x-ndjson'},
+    )
+    assert resp.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert resp.json()['detail'] == 'line too long'
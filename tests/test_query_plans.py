@@ -0,0 +1,195 @@
+import json
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from common.settings import settings
+from repositories.analytics import SQLAAnalyticsRepository
+from repositories.cart import SQLACartRepository
+from repositories.orders import SQLAOrderRepository
+from repositories.partitions import SQLAPartitionRepository
+from repositories.products import SQLAProductRepository
+from repositories.users import SQLAUserRepository
+from services.partitions import PartitionMaintainer
+
+
+SEED_STATEMENTS = [
+    """insert into users (username, hashed_password, role, disabled)
+    select 'user' || i, 'hash', 'CUSTOMER', false
+    from generate_series(1, 2000) i""",
+    """insert into products (title, seller_id, cost, created_at)
+    select 'product ' || i, i % 200 + 1, i,
+    TIMEZONE('utc', now()) - i * interval '1 minute'
+    from generate_series(1, 20000) i""",
+    """insert into orders (owner_id, status, created_at)
+    select users.id, 'OPENED', TIMEZONE('utc', now()) - i * interval '1 hour'
+    from generate_series(1, 10000) i
+    join users on users.username = 'user' || (i % 2000 + 1)""",
+    """insert into orders_products
+    (order_id, product_id, quantity, status, title, cost, seller_id,
+    created_at)
+    select orders.id, products.id, 1, 'PENDING',
+    products.title, products.cost, products.seller_id, orders.created_at
+    from (select id, created_at, row_number() over (order by id) rn
+    from orders) orders
+    cross join (values (0), (10000)) offsets (k)
+    join (select id, title, cost, seller_id,
+    row_number() over (order by id) rn from products)
+    products on products.rn = orders.rn + offsets.k""",
+    """insert into orders_sellers
+    (order_id, seller_id, total_cost, created_at)
+    select order_id, seller_id, sum(quantity * cost), created_at
+    from orders_products
+    group by order_id, seller_id, created_at""",
+    """insert into seller_daily_sales
+    (seller_id, day, revenue, units, orders_count)
+    select seller_id, date(orders.created_at), sum(cost * quantity),
+    sum(quantity), count(distinct orders.id)
+    from orders_products join orders on orders.id = orders_products.order_id
+    group by seller_id, date(orders.created_at)""",
+    """insert into seller_product_daily_sales
+    (seller_id, day, product_id, revenue, units, orders_count)
+    select seller_id, date(orders.created_at), product_id,
+    sum(cost * quantity), sum(quantity), count(*)
+    from orders_products join orders on orders.id = orders_products.order_id
+    group by seller_id, date(orders.created_at), product_id""",
+    """insert into cart (user_id, product_id, quantity)
+    select users.id, products.id, 1
+    from (select id, row_number() over (order by id) rn from users) users
+    cross join (values (0), (1), (2)) offsets (k)
+    join (select id, row_number() over (order by id) rn from products)
+    products on products.rn = users.rn * 3 + offsets.k""",
+    "analyze",
+]
+
+SAMPLE_QUERY = """
+select users.id as user_id, users.username, products.id as product_id,
+products.seller_id, orders.id as order_id
+from orders_products
+join orders on orders.id = orders_products.order_id
+join users on users.id = orders.owner_id
+join products on products.id = orders_products.product_id
+limit 1
+"""
+
+SINGLE_PAGE_TABLES_QUERY = """
+select relname from pg_class
+where relkind = 'r' and relpages <= 1 and relnamespace = 'public'::regnamespace
+"""
+
+users = SQLAUserRepository()
+products = SQLAProductRepository()
+cart = SQLACartRepository()
+orders = SQLAOrderRepository()
+analytics = SQLAAnalyticsRepository()
+TODAY = date.today()
+
+REPOSITORY_QUERIES = {
+    'analytics.get_seller_daily_sales':
+        lambda s, ids: analytics.get_seller_daily_sales(
+            s, ids['seller_id'], TODAY - timedelta(days=29), TODAY),
+    'analytics.get_seller_product_daily_sales':
+        lambda s, ids: analytics.get_seller_product_daily_sales(
+            s, ids['seller_id'], TODAY - timedelta(days=29), TODAY),
+    'users.get_by_username':
+        lambda s, ids: users.get_by_username(s, ids['username']),
+    'users.get_by_id':
+        lambda s, ids: users.get_by_id(s, ids['user_id']),
+    'users.get_revoked':
+        lambda s, ids: users.get_revoked(
+            s, datetime.utcnow() - timedelta(minutes=15)),
+    'products.get_one':
+        lambda s, ids: products.get_one(s, ids['product_id']),
+    'products.check_exists_by_id':
+        lambda s, ids: products.check_exists_by_id(s, ids['product_id']),
+    'products.get_page':
+        lambda s, ids: products.get_page(s, 20),
+    'products.get_page_by_seller':
+        lambda s, ids: products.get_page(s, 20, seller_id=ids['seller_id']),
+    'products.get_seller_products':
+        lambda s, ids: products.get_seller_products(s, ids['seller_id']),
+    'products.search':
+        lambda s, ids: products.search(s, '12345', 20),
+    'cart.get_content':
+        lambda s, ids: cart.get_content(s, ids['user_id']),
+    'cart.is_product_in_cart':
+        lambda s, ids: cart.is_product_in_cart(
+            s, ids['user_id'], ids['product_id']),
+    'orders.get_user_order':
+        lambda s, ids: orders.get_user_order(s, ids['order_id']),
+    'orders.get_user_orders':
+        lambda s, ids: orders.get_user_orders(s, ids['user_id'], 20),
+    'orders.get_user_order_summaries':
+        lambda s, ids: orders.get_user_order_summaries(
+            s, ids['user_id'], 20),
+    'orders.check_exists_by_id':
+        lambda s, ids: orders.check_exists_by_id(s, ids['order_id']),
+    'orders.is_product_in_order':
+        lambda s, ids: orders.is_product_in_order(
+            s, ids['order_id'], ids['product_id']),
+    'orders.get_product_in_seller_order':
+        lambda s, ids: orders.get_product_in_seller_order(
+            s, ids['seller_id'], ids['order_id'], ids['product_id']),
+    'orders.get_seller_order':
+        lambda s, ids: orders.get_seller_order(
+            s, ids['seller_id'], ids['order_id']),
+    'orders.get_seller_lines':
+        lambda s, ids: orders.get_seller_lines(
+            s, ids['seller_id'], [(ids['order_id'], ids['product_id'])]),
+    'orders.get_seller_orders':
+        lambda s, ids: orders.get_seller_orders(s, ids['seller_id'], 20),
+}
+
+
+def _seq_scans(plan: dict) -> list[str]:
+    scans = []
+    if plan['Node Type'] == 'Seq Scan':
+        scans.append(plan['Relation Name'])
+    for subplan in plan.get('Plans', []):
+        scans.extend(_seq_scans(subplan))
+    return scans
+
+
+@pytest.fixture
+async def seeded_db(get_async_sessionmaker) -> dict:
+    await PartitionMaintainer(
+        get_async_sessionmaker, SQLAPartitionRepository(),
+        months_ahead=15, retention_months=0, interval=0,
+    ).run_once(datetime.utcnow() - timedelta(days=450))
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            for statement in SEED_STATEMENTS:
+                await session.execute(text(statement))
+        return (await session.execute(text(SAMPLE_QUERY))).one()._asdict()
+
+
+@pytest.mark.parametrize('query_name', REPOSITORY_QUERIES)
+async def test_repository_query_uses_index(seeded_db, query_name):
+    engine = create_async_engine(settings.db_test_string)
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', capture)
+    try:
+        async with async_sessionmaker(engine)() as session:
+            await REPOSITORY_QUERIES[query_name](session, seeded_db)
+        event.remove(engine.sync_engine, 'before_cursor_execute', capture)
+        assert statements
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql('set random_page_cost = 1.1')
+            single_page_tables = set((await conn.exec_driver_sql(
+                SINGLE_PAGE_TABLES_QUERY)).scalars())
+            for statement, parameters in statements:
+                plan = (await conn.exec_driver_sql(
+                    f'explain (format json) {statement}', parameters
+                )).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans = set(_seq_scans(plan[0]['Plan'])) - single_page_tables
+                assert scans == set(), statement
+    finally:
+        await engine.dispose()
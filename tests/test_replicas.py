@@ -0,0 +1,183 @@
+import asyncio
+from time import time
+
+import pytest
+from sqlalchemy import make_url, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.deps import READ_PRIMARY_COOKIE
+from api.middleware import ReadYourWritesMiddleware
+from common.settings import settings
+from db.replicas import ReplicaRouter
+from repositories.products import (CachedProductRepository,
+                                   SQLAProductRepository)
+from utils.cache import TTLCache
+
+
+REPLICA_DB = 'replica_test'
+
+
+@pytest.fixture
+async def replica_sessionmaker():
+    engine = create_async_engine(
+        settings.db_test_string, isolation_level='AUTOCOMMIT')
+    async with engine.connect() as conn:
+        await conn.execute(text(f'drop database if exists {REPLICA_DB}'))
+        await conn.execute(text(f'create database {REPLICA_DB}'))
+    replica_engine = create_async_engine(
+        make_url(settings.db_test_string).set(database=REPLICA_DB))
+    try:
+        yield async_sessionmaker(replica_engine, expire_on_commit=False)
+    finally:
+        await replica_engine.dispose()
+        async with engine.connect() as conn:
+            await conn.execute(text(f'drop database if exists {REPLICA_DB}'))
+        await engine.dispose()
+
+
+def _dead_sessionmaker() -> async_sessionmaker:
+    return async_sessionmaker(create_async_engine(
+        make_url(settings.db_test_string).set(port=1)))
+
+
+async def _current_database(router: ReplicaRouter,
+                            pinned: bool = False) -> str:
+    async with await router.open_session(pinned) as session:
+        return await session.scalar(text('select current_database()'))
+
+
+async def test_reads_go_to_healthy_replicas(
+    get_async_sessionmaker, replica_sessionmaker
+):
+    router = ReplicaRouter(
+        get_async_sessionmaker,
+        {'replica': replica_sessionmaker, 'dead': _dead_sessionmaker()},
+        check_interval=60, check_timeout=1, max_lag=5,
+    )
+    assert router.choose() is None
+    await router.check()
+    assert router.healthy == {'replica': True, 'dead': False}
+    assert await _current_database(router) == REPLICA_DB
+    assert await _current_database(router, pinned=True) == 'postgres'
+    stats = router.stats()
+    assert stats['replicas']['replica']['reads'] == 1
+    assert stats['replicas']['replica']['lag'] == 0
+    assert stats['replicas']['dead']['lag'] is None
+    assert stats['primary_reads'] == 2
+    assert stats['pinned_reads'] == 1
+
+
+async def test_lagging_replica_falls_back_to_primary(
+    get_async_sessionmaker, replica_sessionmaker
+):
+    router = ReplicaRouter(
+        get_async_sessionmaker, {'replica': replica_sessionmaker},
+        check_interval=60, check_timeout=1, max_lag=-1,
+    )
+    await router.check()
+    assert router.healthy == {'replica': False}
+    assert await _current_database(router) == 'postgres'
+
+
+async def test_failed_replica_falls_back_to_primary_on_first_use(
+    get_async_sessionmaker
+):
+    router = ReplicaRouter(
+        get_async_sessionmaker, {'dead': _dead_sessionmaker()},
+        check_interval=60, check_timeout=1, max_lag=5,
+    )
+    router.healthy['dead'] = True
+    assert await _current_database(router) == 'postgres'
+    assert router.healthy == {'dead': False}
+    assert router.stats()['fallbacks'] == 1
+    assert router.choose() is None
+
+
+@pytest.fixture
+async def standby_sessionmaker():
+    if settings.postgres_test_replica_port is None:
+        pytest.skip('POSTGRES_TEST_REPLICA_PORT is not configured')
+    engine = create_async_engine(make_url(settings.db_test_string).set(
+        port=int(settings.postgres_test_replica_port)))
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        await engine.dispose()
+
+
+async def _wait_until_healthy(router: ReplicaRouter, name: str) -> None:
+    for _ in range(50):
+        await router.check()
+        if router.healthy[name]:
+            return
+        await asyncio.sleep(0.2)
+    raise AssertionError(f'{name} did not catch up, lag {router.lag[name]}')
+
+
+async def test_lagging_standby_falls_back_to_primary(
+    get_async_sessionmaker, standby_sessionmaker
+):
+    router = ReplicaRouter(
+        get_async_sessionmaker, {'standby': standby_sessionmaker},
+        check_interval=60, check_timeout=1, max_lag=0.5,
+    )
+    await _wait_until_healthy(router, 'standby')
+    async with await router.open_session() as session:
+        assert await session.scalar(text('select pg_is_in_recovery()'))
+    async with standby_sessionmaker() as session:
+        await session.execute(text('select pg_wal_replay_pause()'))
+    try:
+        async with get_async_sessionmaker() as session:
+            await session.execute(text(
+                """insert into users (username, hashed_password, role,
+                disabled) values ('standby', 'hash', 'CUSTOMER', false)"""))
+            await session.commit()
+        await asyncio.sleep(1)
+        await router.check()
+        assert router.healthy == {'standby': False}
+        assert router.lag['standby'] > 0.5
+        async with await router.open_session() as session:
+            assert not await session.scalar(
+                text('select pg_is_in_recovery()'))
+    finally:
+        async with standby_sessionmaker() as session:
+            await session.execute(text('select pg_wal_replay_resume()'))
+    await _wait_until_healthy(router, 'standby')
+
+
+async def test_replica_reads_cached_no_longer_than_max_lag(
+    get_async_sessionmaker, create_product_in_db
+):
+    await create_product_in_db('title', 100, 1)
+    router = ReplicaRouter(
+        get_async_sessionmaker, {'replica': get_async_sessionmaker},
+        check_interval=60, check_timeout=1, max_lag=5,
+    )
+    await router.check()
+    seller_products_cache = TTLCache(maxsize=10, ttl=300)
+    repository = CachedProductRepository(
+        SQLAProductRepository(), TTLCache(maxsize=10, ttl=300),
+        seller_products_cache, replica_ttl=0,
+    )
+    async with await router.open_session() as session:
+        assert len(await repository.get_seller_products(session, 1)) == 1
+    assert seller_products_cache.get(1) is None
+    async with await router.open_session(pinned=True) as session:
+        await repository.get_seller_products(session, 1)
+    assert len(seller_products_cache.get(1)) == 1
+
+def test_mutation_pins_reads_to_primary(app, client):
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+    reg_url = app.url_path_for('register_user')
+
+    response = client.get(app.url_path_for('get_products'))
+    assert READ_PRIMARY_COOKIE not in response.cookies
+    response = client.post(reg_url, json={'username': 'test'})
+    assert response.status_code == 422
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+    response = client.post(reg_url, json={
+        'username': 'test', 'role': 'customer', 'password': 'test'})
+    assert response.status_code == 200
+    until = float(response.cookies[READ_PRIMARY_COOKIE])
+    assert time() < until <= time() + 5
@@ -0,0 +1,196 @@
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from models.users import UserRole
+
+
+async def test_get_seller_sales_only_own_products(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    own_item_id = await create_product_in_db('own', 100, seller_id)
+    other_item_id = await create_product_in_db('other', 200, seller_id + 1)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': own_item_id, 'quantity': 1},
+                      {'id': other_item_id, 'quantity': 2}]
+    )
+    await create_order_in_db(
+        customer_id, [{'id': other_item_id, 'quantity': 1}]
+    )
+    sales_url = app.url_path_for('get_seller_sales_handler')
+    resp = client.get(url=sales_url, headers=seller_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    body = resp.json()
+    assert [order['id'] for order in body['items']] == [order_id]
+    assert [item['id'] for item in body['items'][0]['content']] == [
+        own_item_id]
+    assert body['items'][0]['total_cost'] == 100
+    assert body['next_cursor'] is None
+    sale_url = app.url_path_for('get_seller_sale_handler', order_id=order_id)
+    resp = client.get(url=sale_url, headers=seller_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert [item['id'] for item in resp.json()['content']] == [own_item_id]
+
+
+async def test_get_seller_sales_paginated(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('own', 100, seller_id)
+    order_ids = [
+        await create_order_in_db(customer_id, [{'id': item_id, 'quantity': 1}])
+        for _ in range(3)
+    ]
+    sales_url = app.url_path_for('get_seller_sales_handler')
+    resp = client.get(url=sales_url, params={'limit': 2},
+                      headers=seller_auth_headers)
+    body = resp.json()
+    assert [order['id'] for order in body['items']] == order_ids[:0:-1]
+    resp = client.get(
+        url=sales_url,
+        params={'limit': 2, 'cursor': body['next_cursor']},
+        headers=seller_auth_headers
+    )
+    body = resp.json()
+    assert [order['id'] for order in body['items']] == order_ids[:1]
+    assert body['next_cursor'] is None
+
+
+async def test_get_seller_sale_fail_foreign_order(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('other', 100, seller_id + 1)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1}])
+    sale_url = app.url_path_for('get_seller_sale_handler', order_id=order_id)
+    resp = client.get(url=sale_url, headers=seller_auth_headers)
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def test_update_product_status_success(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+    get_order_from_db,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('own', 100, seller_id)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1}])
+    update_url = app.url_path_for(
+        'update_product_status_handler',
+        order_id=order_id, product_id=item_id
+    )
+    resp = client.patch(url=update_url, json={'status': 'shipping'},
+                        headers=seller_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    order = await get_order_from_db(order_id)
+    assert order['content'][0]['status'] == 'SHIPPING'
+    assert order['status'] == 'OPENED'
+    assert order['received_count'] == 0
+
+
+async def test_update_products_status_batch(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    create_product_in_db,
+    create_order_in_db,
+    get_order_from_db,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    seller_id, seller_auth_headers = await create_test_user_and_get_token(
+        name='seller',
+        role=UserRole.SELLER
+    )
+    item_id = await create_product_in_db('own', 100, seller_id)
+    item1_id = await create_product_in_db('own1', 200, seller_id)
+    other_item_id = await create_product_in_db('other', 200, seller_id + 1)
+    order_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1},
+                      {'id': item1_id, 'quantity': 1}])
+    order1_id = await create_order_in_db(
+        customer_id, [{'id': item_id, 'quantity': 1},
+                      {'id': other_item_id, 'quantity': 1}])
+    update_url = app.url_path_for('update_products_status_handler')
+    resp = client.patch(url=update_url, headers=seller_auth_headers, json={
+        'items': [
+            {'order_id': order_id, 'product_id': item_id,
+             'status': 'shipping'},
+            {'order_id': order1_id, 'product_id': other_item_id,
+             'status': 'shipping'},
+        ]
+    })
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    order = await get_order_from_db(order_id)
+    assert {line['status'] for line in order['content']} == {'PENDING'}
+
+    resp = client.patch(url=update_url, headers=seller_auth_headers, json={
+        'items': [
+            {'order_id': order_id, 'product_id': item_id,
+             'status': 'shipping'},
+            {'order_id': order_id, 'product_id': item1_id,
+             'status': 'ready_to_send'},
+            {'order_id': order1_id, 'product_id': item_id,
+             'status': 'shipping'},
+        ]
+    })
+    assert resp.status_code == status.HTTP_200_OK
+    order = await get_order_from_db(order_id)
+    assert {line['product_id']: line['status']
+            for line in order['content']} == {
+        item_id: 'SHIPPING', item1_id: 'READY_TO_SEND'}
+    order1 = await get_order_from_db(order1_id)
+    assert {line['product_id']: line['status']
+            for line in order1['content']} == {
+        item_id: 'SHIPPING', other_item_id: 'PENDING'}
+
+    resp = client.patch(url=update_url, headers=seller_auth_headers,
+                        json={'items': []})
+    assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -1,9 +1,16 @@
+import asyncio
 import datetime
+from time import sleep
 
 from fastapi import FastAPI, status
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 from models.users import UserRole
+from common.settings import settings
+from repositories.users import SQLAUserRepository
+from services.auth import principal_cache, token_denylist
+from utils.executor import BoundedExecutor
 
 
 async def test_create_user_success(
@@ -94,3 +101,185 @@ async def test_user_get_my_profile_success(
     user = resp.json()
     assert user['username'] == 'test_name'
     assert user['role'] == UserRole.CUSTOMER.value
+
+
+async def test_current_user_served_from_principal_cache(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+):
+    _, auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    get_me_url = app.url_path_for('get_my_profile')
+    hits = principal_cache.hits
+    resp = client.get(url=get_me_url, headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.get(url=get_me_url, headers=auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert principal_cache.hits - hits == 1
+
+
+async def test_disabled_user_invalidates_principal_cache(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+):
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    _, admin_auth_headers = await create_test_user_and_get_token(
+        name='admin',
+        role=UserRole.ADMIN
+    )
+    get_me_url = app.url_path_for('get_my_profile')
+    update_user_url = app.url_path_for('update_user_handler',
+                                       user_id=customer_id)
+    resp = client.get(url=get_me_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.patch(
+        url=update_user_url,
+        json={'disabled': True},
+        headers=admin_auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.get(url=get_me_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert resp.json()['detail'] == 'Inactive user'
+
+
+async def test_admin_metrics_report_password_executor(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+):
+    _, admin_auth_headers = await create_test_user_and_get_token(
+        name='admin',
+        role=UserRole.ADMIN
+    )
+    metrics_url = app.url_path_for('get_metrics_handler')
+    resp = client.get(url=metrics_url, headers=admin_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    password_executor = resp.json()['password_executor']
+    assert password_executor['calls'] >= 2
+    assert password_executor['queue_depth'] == 0
+    assert password_executor['running'] == 0
+
+
+def test_bounded_executor_runs_on_several_event_loops():
+    executor = BoundedExecutor(max_workers=2, max_concurrency=1)
+
+    async def run_concurrently():
+        return await asyncio.gather(
+            executor.run(sleep, 0.01), executor.run(sleep, 0.01))
+
+    for _ in range(2):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run_concurrently())
+        finally:
+            loop.close()
+    assert executor.stats()['calls'] == 4
+
+async def test_self_contained_token_skips_user_lookup(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, 'self_contained_tokens', True)
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    cart_url = app.url_path_for('get_cart_handler')
+    lookups = principal_cache.hits + principal_cache.misses
+    resp = client.get(url=cart_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.get(url=cart_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert principal_cache.hits + principal_cache.misses == lookups
+
+
+async def test_self_contained_token_revoked_on_role_change(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    monkeypatch,
+):
+    monkeypatch.setattr(settings, 'self_contained_tokens', True)
+    customer_id, customer_auth_headers = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    _, admin_auth_headers = await create_test_user_and_get_token(
+        name='admin',
+        role=UserRole.ADMIN
+    )
+    cart_url = app.url_path_for('get_cart_handler')
+    update_user_url = app.url_path_for('update_user_handler',
+                                       user_id=customer_id)
+    resp = client.patch(
+        url=update_user_url,
+        json={'role': UserRole.SELLER},
+        headers=admin_auth_headers
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    resp = client.get(url=cart_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    token_denylist.clear()
+    resp = client.get(url=cart_url, headers=customer_auth_headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+async def test_token_denylist_loads_only_recent_revocations(
+    get_async_sessionmaker,
+    create_test_user_and_get_token,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    old_id, _ = await create_test_user_and_get_token(
+        name='old',
+        role=UserRole.CUSTOMER
+    )
+    now = datetime.datetime.utcnow()
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            await session.execute(text(
+                """update users set token_version = 1, disabled = true,
+                token_version_changed_at = :changed_at where id = :id"""),
+                [{'id': customer_id, 'changed_at': now},
+                 {'id': old_id,
+                  'changed_at': now - datetime.timedelta(days=1)}])
+        await token_denylist.refresh(SQLAUserRepository(), session)
+    assert token_denylist.is_outdated(customer_id, 0)
+    assert token_denylist.is_disabled(customer_id)
+    assert not token_denylist.is_outdated(old_id, 0)
+    token_denylist.clear()
+
+
+async def test_disabled_user_cannot_login(
+    app: FastAPI,
+    client: TestClient,
+    create_test_user_and_get_token,
+    get_async_sessionmaker,
+):
+    customer_id, _ = await create_test_user_and_get_token(
+        name='customer',
+        role=UserRole.CUSTOMER
+    )
+    async with get_async_sessionmaker() as session:
+        async with session.begin():
+            await session.execute(
+                text('update users set disabled = true where id = :id'),
+                {'id': customer_id})
+    resp = client.post(
+        url=app.url_path_for('login_for_auth_token'),
+        data={'username': 'customer', 'password': 'test'},
+    )
+    assert resp.status_code == status.HTTP_400_BAD_REQUEST
+    assert resp.json()['detail'] == 'Inactive user'
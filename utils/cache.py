@@ -0,0 +1,76 @@
+import sys
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+from time import monotonic
+from typing import Any, Hashable
+
+
+_missing = object()
+
+
+def approximate_sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        size += sum(approximate_sizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(approximate_sizeof(key) + approximate_sizeof(item)
+                    for key, item in value.items())
+    elif is_dataclass(value):
+        size += sum(approximate_sizeof(getattr(value, field.name))
+                    for field in fields(value))
+    return size
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _missing)
+        if item is _missing:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any,
+            ttl: float | None = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'memory_bytes': sum(
+                approximate_sizeof(key) + approximate_sizeof(value)
+                for key, (_, value) in self._data.items()
+            ),
+        }
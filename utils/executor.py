@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from time import perf_counter
+from typing import Any, Callable
+
+
+class BoundedExecutor:
+    def __init__(self, max_workers: int, max_concurrency: int,
+                 name: str = 'bounded-executor') -> None:
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.waiting = 0
+        self.running = 0
+        self.calls = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        started_at = perf_counter()
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        semaphore = self._semaphore
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await loop.run_in_executor(
+                self._executor, partial(func, *args)
+            )
+        finally:
+            self.running -= 1
+            semaphore.release()
+            latency = perf_counter() - started_at
+            self.calls += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self) -> dict:
+        return {
+            'max_workers': self.max_workers,
+            'max_concurrency': self.max_concurrency,
+            'queue_depth': self.waiting + max(
+                0, self.running - self.max_workers),
+            'running': self.running,
+            'calls': self.calls,
+            'avg_latency': self.total_latency / self.calls
+            if self.calls else 0.0,
+            'max_latency': self.max_latency,
+        }
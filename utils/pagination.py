@@ -0,0 +1,22 @@
+import base64
+from datetime import datetime
+from enum import auto, StrEnum
+
+
+class SortOrder(StrEnum):
+    ASC = auto()
+    DESC = auto()
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = f'{created_at.isoformat()},{id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, id = raw.split(',')
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeError):
+        raise ValueError('invalid cursor')
@@ -0,0 +1,124 @@
+import asyncio
+import codecs
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+
+MAX_LINE_LENGTH = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class InvalidRow:
+    error: str
+
+
+class StreamTooLarge(ValueError):
+    pass
+
+
+async def limit_stream(chunks: AsyncIterator[bytes],
+                       max_bytes: int) -> AsyncIterator[bytes]:
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise StreamTooLarge('request body too large')
+        yield chunk
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split('\n')
+        for line in lines:
+            if len(line) > MAX_LINE_LENGTH:
+                raise StreamTooLarge('line too long')
+            yield line.rstrip('\r')
+        if len(buffer) > MAX_LINE_LENGTH:
+            raise StreamTooLarge('line too long')
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer.rstrip('\r')
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    body = b''.join([chunk async for chunk in chunks])
+    rows = json.loads(body)
+    if not isinstance(rows, list):
+        raise ValueError('expected a json array')
+    for row in rows:
+        yield row
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = InvalidRow(f'invalid json: {e}')
+        yield row
+
+
+async def iter_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    header = None
+    record, record_length = [], 0
+    async for line in iter_lines(chunks):
+        record.append(line + '\n')
+        record_length += len(line)
+        if record_length > MAX_LINE_LENGTH:
+            raise StreamTooLarge('csv record too long')
+        try:
+            values = _read_csv_record(record)
+        except csv.Error as e:
+            values = InvalidRow(f'invalid csv: {e}')
+        if values is None:
+            continue
+        record, record_length = [], 0
+        if isinstance(values, InvalidRow):
+            if header is None:
+                raise ValueError(values.error)
+            yield values
+            continue
+        if len(values) <= 1 and not ''.join(values).strip():
+            continue
+        if header is None:
+            header = [value.strip() for value in values]
+            continue
+        yield dict(zip(header, values))
+    if record:
+        if header is None:
+            raise ValueError('unterminated quoted field in csv')
+        yield InvalidRow('unterminated quoted field in csv')
+
+
+def _read_csv_record(lines: list[str]) -> list[str] | None:
+    reader = csv.reader([*lines, '\n'])
+    values = next(reader)
+    if reader.line_num > len(lines):
+        return None
+    return values
+
+
+ROW_PARSERS = {
+    'application/json': iter_json_array,
+    'application/x-ndjson': iter_ndjson,
+    'text/csv': iter_csv,
+}
+
+
+async def iter_server_sent_events(
+    queue: asyncio.Queue, heartbeat: float
+) -> AsyncIterator[str]:
+    while True:
+        try:
+            event = await asyncio.wait_for(queue.get(), heartbeat)
+        except asyncio.TimeoutError:
+            yield ': heartbeat\n\n'
+            continue
+        yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"